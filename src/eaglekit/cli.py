@@ -1,23 +1,28 @@
 
 from __future__ import annotations
+import copy
+import functools
 import json
 import logging
+import re
+import shlex
+from collections import Counter
 from pathlib import Path
-import subprocess
 import typer
-from rich.table import Table
 from rich.console import Console
-from rich.prompt import Prompt
-from rich.panel import Panel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, NoReturn, Tuple
 from .config import (
-    load_registry, save_registry, get_paths
+    load_registry, save_registry, get_paths, ensure_paths,
+    yaml_load, yaml_dump, read_yaml_sidecar, write_yaml_sidecar,
+    Stamp, stat_stamp,
 )
 from .core import Project
-import yaml
 import os
 import sys
 
+# yaml, rich.table/panel/prompt and subprocess are imported where they are
+# used so that startup (e.g. `ek --help`) does not pay for them.
+
 app = typer.Typer(
     help="""Eagle Kit — Development project manager CLI.
 
@@ -49,6 +54,9 @@ console = Console()
 _err_console = Console(stderr=True)
 logger = logging.getLogger(__name__)
 
+# Plugins and entry points only need the Typer app and the shared console
+__all__ = ["app", "console"]
+
 # ---------- Plugin system ----------
 _loaded_plugins = []
 _failed_plugins = []
@@ -159,11 +167,19 @@ logging.basicConfig(
 _load_plugins()
 
 # ---------- Registry & project helpers ----------
+def _registry_stamp() -> Optional[Stamp]:
+    """Stamp of the registry file, or None if it does not exist yet."""
+    return stat_stamp(get_paths().registry_file)
+
 def _reg() -> Dict[str, Any]:
+    # load_registry reparses only when the file changed and returns a private copy
     return load_registry()
 
 def _save(reg: Dict[str, Any]) -> None:
     save_registry(reg)
+    _PROJECT_INDEX_CACHE.clear()
+    _project_lookup.cache_clear()
+    _resolve_project_path_at.cache_clear()
 
 def _cur_ws(reg: Dict[str, Any], override: Optional[str]) -> str:
     ws = override or reg.get("current_workspace", "default")
@@ -174,24 +190,52 @@ def _cur_ws(reg: Dict[str, Any], override: Optional[str]) -> str:
 def _projects(reg: Dict[str, Any], ws: str) -> Dict[str, Any]:
     return reg["workspaces"][ws]["projects"]
 
-def _project_by_cwd(reg: Dict[str, Any], wsname: str, cwd: Path | None = None) -> Project | None:
-    cwd = cwd or Path.cwd().resolve()
-    best = None
-    best_len = -1
+# Workspace name -> (registry stamp, index built from that registry)
+_PROJECT_INDEX_CACHE: Dict[str, Tuple[Stamp, Dict[str, Project]]] = {}
+
+def _project_index(reg: Dict[str, Any], wsname: str) -> Dict[str, Project]:
+    """Projects of a workspace keyed by resolved path.
+
+    reg must be the registry as saved on disk: the index is reused, symlinks
+    and all already resolved, until the registry file changes.
+    """
+    stamp = _registry_stamp()
+    hit = _PROJECT_INDEX_CACHE.get(wsname)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    index: Dict[str, Project] = {}
     for name, meta in _projects(reg, wsname).items():
+        # registry.yaml can be hand-edited, so entries may go through symlinks
         p = Path(meta["path"]).expanduser().resolve()
-        try:
-            _ = cwd.relative_to(p)
-            plen = len(str(p))
-            if plen > best_len:
-                best = Project(name=name, path=p)
-                best_len = plen
-        except Exception as e:
-            logger.debug(f"Project {name} is not a parent of cwd: {e}")
-            continue
-    return best
+        index.setdefault(str(p), Project(name=name, path=p))
+    if stamp is not None:
+        _PROJECT_INDEX_CACHE[wsname] = (stamp, index)
+    return index
+
+def _project_by_cwd(reg: Dict[str, Any], wsname: str, cwd: Path | None = None) -> Project | None:
+    cwd = cwd or Path.cwd().resolve()
+    index = _project_index(reg, wsname)
+    # Deepest directory first, so the first hit is the innermost project
+    for parent in (cwd, *cwd.parents):
+        proj = index.get(str(parent))
+        if proj is not None:
+            return proj
+    return None
 
 def _project_from_name_or_cwd(name: Optional[str], ws: Optional[str]) -> Project:
+    # Unnamed lookups depend on the working directory, which can change in-process
+    cwd = None if name else os.getcwd()
+    proj = _project_lookup(name, ws, _registry_stamp(), cwd)
+    # Hand out a fresh Project so callers can't alter the cached one
+    return Project(name=proj.name, path=proj.path)
+
+@functools.lru_cache(maxsize=8)
+def _project_lookup(
+    name: Optional[str],
+    ws: Optional[str],
+    stamp: Optional[Stamp] = None,
+    cwd: Optional[str] = None,
+) -> Project:
     reg = _reg()
     wsname = _cur_ws(reg, ws)
     if name:
@@ -200,7 +244,7 @@ def _project_from_name_or_cwd(name: Optional[str], ws: Optional[str]) -> Project
             console.print(f"[red]Unknown project in workspace '{wsname}':[/] {name}")
             raise typer.Exit(code=1)
         return Project(name=name, path=Path(pr["path"]).expanduser())
-    pr = _project_by_cwd(reg, wsname)
+    pr = _project_by_cwd(reg, wsname, Path(cwd).resolve() if cwd else None)
     if pr:
         return pr
     console.print("[red]No project matched the current directory.[/] Use -n/--name or --ws, or run inside a registered project.")
@@ -211,6 +255,11 @@ def _resolve_project_path(project_name: str, ws: Optional[str] = None) -> Option
     
     Returns None if project doesn't exist.
     """
+    return _resolve_project_path_at(project_name, ws, _registry_stamp())
+
+@functools.lru_cache(maxsize=32)
+def _resolve_project_path_at(project_name: str, ws: Optional[str], stamp: Optional[Stamp]) -> Optional[Path]:
+    # stamp only keys the cache on the registry version
     try:
         reg = _reg()
         wsname = _cur_ws(reg, ws)
@@ -222,9 +271,9 @@ def _resolve_project_path(project_name: str, ws: Optional[str] = None) -> Option
         logger.warning(f"Could not resolve path for project {project_name}: {e}")
         return None
 
+@functools.lru_cache(maxsize=256)
 def _clean_variable_name(name: str) -> str:
     """Clean project name to be a valid shell variable name."""
-    import re
     # Replace non-alphanumeric chars with underscore, ensure starts with letter
     clean = re.sub(r'[^a-zA-Z0-9_]', '_', name)
     clean = re.sub(r'^[0-9]', '_', clean)  # Can't start with number
@@ -264,25 +313,53 @@ def _generate_project_variables(ws: Optional[str] = None) -> None:
     console.print(f"[dim]✓ Variables updated: {len(projects)} projects in {vars_file}[/]")
 
 def _git_root(path: Path) -> Optional[Path]:
-    res = subprocess.run(["git", "-C", str(path), "rev-parse", "--show-toplevel"], capture_output=True, text=True)
-    if res.returncode == 0:
-        return Path(res.stdout.strip())
+    """Top of the work tree containing path: the nearest ancestor with a .git entry."""
+    path = path.resolve()
+    for parent in (path, *path.parents):
+        if (parent / ".git").exists():
+            return parent
     return None
 
+def _git_dir(root: Path) -> Path:
+    """The git directory of a work tree, following a 'gitdir:' file (worktrees, submodules)."""
+    dotgit = root / ".git"
+    if dotgit.is_file():
+        line = dotgit.read_text(encoding="utf-8").splitlines()[0].strip()
+        if line.startswith("gitdir:"):
+            return (root / line[len("gitdir:"):].strip()).resolve()
+    return dotgit
+
+# Paths that stay per-worktree; everything else lives in the common git dir
+_GIT_WORKTREE_PATHS = ("HEAD", "index", "logs/HEAD", "ORIG_HEAD", "MERGE_HEAD", "FETCH_HEAD")
+
 def _git_path(path: Path, what: str) -> Optional[Path]:
-    res = subprocess.run(["git", "-C", str(path), "rev-parse", "--git-path", what], capture_output=True, text=True)
-    if res.returncode == 0:
-        return Path(res.stdout.strip())
-    return None
+    """Absolute path of what inside the repo's git dir, like 'git rev-parse --git-path'."""
+    root = _git_root(path)
+    if root is None:
+        return None
+    gitdir = _git_dir(root)
+    commondir = gitdir / "commondir"
+    if what not in _GIT_WORKTREE_PATHS and commondir.is_file():
+        gitdir = (gitdir / commondir.read_text(encoding="utf-8").strip()).resolve()
+    return gitdir / what
 
 def _ensure_line(file: Path, line: str) -> bool:
     file.parent.mkdir(parents=True, exist_ok=True)
-    if file.exists():
-        txt = file.read_text(encoding="utf-8").splitlines()
-        if any(l.strip() == line for l in txt):
+    raw = line.encode("utf-8")
+    try:
+        data = file.read_bytes()
+    except FileNotFoundError:
+        data = b""
+    # Only split into lines when the entry appears somewhere in the file
+    if raw in data:
+        needle = raw + b"\n"
+        if data.startswith(needle) or b"\n" + needle in data or data == raw or data.endswith(b"\n" + raw):
+            return False
+        # Slow path: the entry may be padded with whitespace or end in \r
+        if any(l.strip() == raw for l in data.splitlines()):
             return False
-    with file.open("a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    with file.open("ab") as f:
+        f.write(raw + b"\n" if not data or data.endswith(b"\n") else b"\n" + raw + b"\n")
     return True
 
 # ---------- Defaults / first-run wizard ----------
@@ -290,24 +367,35 @@ def _defaults_path() -> Path:
     return get_paths().defaults_file
 
 def _load_defaults() -> Dict[str, Any]:
-    p = _defaults_path()
-    if not p.exists():
-        return {}
-    try:
-        return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-    except Exception as e:
-        logger.error(f"Could not load defaults from {p}: {e}")
-        return {}
+    # Served from the YAML cache while defaults.yaml is unchanged
+    return _read_yaml(_defaults_path())
 
 def _save_defaults(cfg: Dict[str, Any]) -> None:
-    _defaults_path().parent.mkdir(parents=True, exist_ok=True)
-    _defaults_path().write_text(yaml.safe_dump(cfg, sort_keys=True), encoding="utf-8")
+    _write_yaml(ensure_paths().defaults_file, cfg, sort_keys=True)
+
+def _first_run_sentinel() -> Path:
+    """Empty marker written once the wizard has run; defaults.yaml keeps the settings."""
+    return get_paths().config_dir / ".first_run_done"
+
+def _mark_first_run_done() -> None:
+    try:
+        _first_run_sentinel().touch()
+    except OSError as e:
+        logger.debug(f"Could not write first-run marker: {e}")
 
 def _first_run_needed() -> bool:
-    d = _load_defaults()
-    return not d.get("first_run_done", False)
+    # A single stat on the hot path instead of parsing defaults.yaml
+    if _first_run_sentinel().exists():
+        return False
+    if _load_defaults().get("first_run_done", False):
+        # Set up before the marker existed
+        _mark_first_run_done()
+        return False
+    return True
 
 def _wizard() -> None:
+    from rich.panel import Panel
+    from rich.prompt import Prompt
     # ASCII Art Logo
     logo = """
     ███████╗ █████╗  ██████╗ ██╗     ███████╗    ██╗  ██╗██╗████████╗
@@ -335,6 +423,9 @@ def _wizard() -> None:
     ))
     
     d = _load_defaults()
+    rc_file = _shell_rc_file()
+    # rc-file additions are collected here and appended in a single write at the end
+    pending_rc_lines: List[str] = []
     
     # 1. Configuración de usuario
     console.print("\n[bold blue]📝 Configuración de Usuario[/]")
@@ -437,23 +528,15 @@ def _wizard() -> None:
         d.setdefault("preferences", {})["shell_variables"] = True
         console.print("[dim]✓ Variables automáticas habilitadas[/]")
         
-        # Auto-setup sourcing
-        shell = os.environ.get('SHELL', '/bin/bash')
-        if 'zsh' in shell:
-            rc_file = Path.home() / '.zshrc'
-        else:
-            rc_file = Path.home() / '.bashrc'
-            
+        # Auto-setup sourcing (written together with the shell function below)
         source_line = "source ~/.eagle_projects"
         
         # Check if already configured
         if rc_file.exists() and source_line in rc_file.read_text():
             console.print("[dim]✓ Auto-sourcing ya configurado[/]")
         else:
-            # Add sourcing line
-            with open(rc_file, 'a') as f:
-                f.write(f"\n# Eagle Kit project variables\n{source_line}\n")
-            console.print(f"[dim]✓ Auto-sourcing agregado a {rc_file.name}[/]")
+            pending_rc_lines.append(f"\n# Eagle Kit project variables\n{source_line}\n")
+            console.print(f"[dim]✓ Auto-sourcing se agregará a {rc_file.name}[/]")
             
     else:
         d.setdefault("preferences", {})["shell_variables"] = False
@@ -494,18 +577,30 @@ def _wizard() -> None:
     d["setup_version"] = "1.0"
     d["setup_date"] = str(Path.cwd())  # Placeholder for setup tracking
     _save_defaults(d)
+    _mark_first_run_done()
     
     # Instalar shell integration si fue habilitada
+    pending_integration_block: Optional[str] = None
+    shell_installed = False
     if d.get("preferences", {}).get("shell_integration"):
         try:
-            shell_install()
+            if _shell_integration_installed(rc_file):
+                console.print("[yellow]Shell integration already installed[/]")
+            else:
+                pending_integration_block = _shell_integration_block()
             shell_installed = True
         except Exception as e:
-            shell_installed = False
             logger.warning(f"Shell integration installation failed: {e}")
             console.print(f"[yellow]Warning: Could not install shell integration: {e}[/]")
-    else:
-        shell_installed = False
+    
+    # Una sola escritura al rc file para todo lo pendiente
+    if pending_rc_lines or pending_integration_block:
+        with rc_file.open('a', encoding='utf-8') as f:
+            f.write(''.join(pending_rc_lines) + (pending_integration_block or ''))
+        if pending_rc_lines:
+            console.print(f"[dim]✓ Auto-sourcing agregado a {rc_file.name}[/]")
+        if pending_integration_block:
+            console.print(f"[green]✓ Shell integration installed in {rc_file}[/]")
     
     # Resumen final
     console.print("\n" + "=" * 60)
@@ -532,7 +627,7 @@ def _wizard() -> None:
 
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
-    if _first_run_needed() and (not ctx.invoked_subcommand):
+    if (not ctx.invoked_subcommand) and _first_run_needed():
         _wizard()
         console.print("\n[bold blue]🎯 ¡Listo para empezar![/]")
         console.print("[dim]Escribe [bold]ek --help[/] para ver todos los comandos disponibles.[/]")
@@ -595,6 +690,7 @@ def ignore_explain():
 
     Helps you choose the right strategy for your workflow.
     """
+    from rich.panel import Panel
     console.print(Panel("Opciones:\nlocal -> .git/info/exclude (solo tú) [recomendado]\nglobal -> ~/.config/git/ignore\nrepo -> .gitignore (versionado)\nnone -> no tocar nada", title="Eagle Kit — Ignore .eagle/"))
 
 def _apply_repo_ignore(repo_root: Path) -> bool:
@@ -608,6 +704,7 @@ def _apply_local_ignore(repo_root: Path) -> bool:
     return _ensure_line(excl, ".eagle/")
 
 def _ensure_global_excludes() -> Path:
+    import subprocess
     res = subprocess.run(["git", "config", "--global", "core.excludesFile"], capture_output=True, text=True)
     path = res.stdout.strip()
     if not path:
@@ -625,6 +722,8 @@ def _apply_global_ignore() -> bool:
 
 @ignore_app.command("status")
 def ignore_status():
+    from rich.table import Table
+    import subprocess
     root = _git_root(Path.cwd())
     if not root:
         console.print("No es un repo Git.")
@@ -642,7 +741,8 @@ def ignore_status():
     table = Table(title=f"Ignore status for repo: {root.name}")
     table.add_column("Scope"); table.add_column("File"); table.add_column("Contains .eagle/?")
     table.add_row("repo (.gitignore)", str(root / ".gitignore"), "✅" if repo_has else "—")
-    table.add_row("local (.git/info/exclude)", str(excl) if excl else "(n/a)", "✅" if local_has else "—")
+    excl_shown = os.path.relpath(excl, root) if excl else "(n/a)"
+    table.add_row("local (.git/info/exclude)", excl_shown, "✅" if local_has else "—")
     table.add_row("global (core.excludesFile)", str(gpath), "✅" if global_has else "—")
     console.print(table)
 
@@ -700,6 +800,32 @@ After installation: 'ek cd project' will navigate directly to the project.
 )
 app.add_typer(shell_app, name="shell")
 
+_SHELL_MARKER_START = "# Eagle Kit shell integration - START"
+_SHELL_MARKER_END = "# Eagle Kit shell integration - END"
+
+def _shell_rc_file() -> Path:
+    """Return the rc file for the user's shell (~/.zshrc or ~/.bashrc)."""
+    shell = os.environ.get('SHELL', '/bin/bash')
+    return Path.home() / ('.zshrc' if 'zsh' in shell else '.bashrc')
+
+def _shell_integration_installed(rc_file: Path) -> bool:
+    return rc_file.exists() and _SHELL_MARKER_START in rc_file.read_text()
+
+def _shell_integration_block() -> str:
+    """Build the marked shell-function block to append to an rc file."""
+    import subprocess
+    
+    function_code = subprocess.run([
+        sys.executable, "-c", 
+        "from eaglekit.wrapper import generate_shell_function; print(generate_shell_function())"
+    ], capture_output=True, text=True)
+    
+    if function_code.returncode != 0:
+        raise RuntimeError("Error getting shell function")
+    
+    function = function_code.stdout.strip()
+    return f"\n{_SHELL_MARKER_START}\n{function}\n{_SHELL_MARKER_END}\n"
+
 @shell_app.command("install")
 def shell_install():
     """Install Eagle Kit shell function for direct navigation.
@@ -709,41 +835,22 @@ def shell_install():
     'ek cd' commands and navigates directly while preserving all
     other Eagle Kit functionality.
     """
-    import subprocess
-    
-    # Detect shell
-    shell = os.environ.get('SHELL', '/bin/bash')
-    if 'zsh' in shell:
-        rc_file = Path.home() / '.zshrc'
-    else:
-        rc_file = Path.home() / '.bashrc'
+    rc_file = _shell_rc_file()
     
-    # Get shell function
-    function_code = subprocess.run([
-        sys.executable, "-c", 
-        "from eaglekit.wrapper import generate_shell_function; print(generate_shell_function())"
-    ], capture_output=True, text=True)
+    # Check if already installed
+    if _shell_integration_installed(rc_file):
+        console.print("[yellow]Shell integration already installed[/]")
+        console.print(f"[dim]Found in: {rc_file}[/]")
+        return
     
-    if function_code.returncode != 0:
+    try:
+        integration_block = _shell_integration_block()
+    except RuntimeError:
         console.print("[red]Error getting shell function[/]")
         raise typer.Exit(1)
     
-    function = function_code.stdout.strip()
-    marker_start = "# Eagle Kit shell integration - START"
-    marker_end = "# Eagle Kit shell integration - END"
-    
-    # Check if already installed
-    if rc_file.exists():
-        content = rc_file.read_text()
-        if marker_start in content:
-            console.print("[yellow]Shell integration already installed[/]")
-            console.print(f"[dim]Found in: {rc_file}[/]")
-            return
-    
     # Add function to rc file
-    integration_block = f"\n{marker_start}\n{function}\n{marker_end}\n"
-    
-    with open(rc_file, 'a') as f:
+    with rc_file.open('a', encoding='utf-8') as f:
         f.write(integration_block)
     
     console.print(f"[green]✓ Shell integration installed in {rc_file}[/]")
@@ -858,73 +965,260 @@ Branch tasks override project tasks with the same name.
 app.add_typer(run_app, name="run")
 
 def _current_branch(proj: Project) -> str:
-    res = subprocess.run(["git", "-C", str(proj.path), "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True)
+    return _branch_at(str(proj.path))
+
+@functools.lru_cache(maxsize=32)
+def _branch_at(path: str) -> str:
+    """Current branch of the repo at path, or "detached".
+
+    Reads HEAD from the git dir directly (following a '.git' file for
+    worktrees and submodules); only falls back to forking git when there is
+    no .git at path (projects nested inside a repo).
+    """
+    try:
+        ref = (_git_dir(Path(path)) / "HEAD").read_text(encoding="utf-8").strip()
+    except (OSError, IndexError):
+        ref = None
+    if ref is not None:
+        if ref.startswith("ref: refs/heads/"):
+            return ref[len("ref: refs/heads/"):] or "detached"
+        return "detached"
+    import subprocess
+    res = subprocess.run(["git", "-C", path, "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True)
     if res.returncode == 0:
         b = res.stdout.strip()
-        return b if b else "detached"
+        # git prints the literal "HEAD" when detached
+        return b if b and b != "HEAD" else "detached"
     return "detached"
 
-def _read_yaml(p: Path) -> Dict[str, Any]:
-    if not p.exists():
-        return {}
+# Parsed YAML documents keyed by path -> (stamp, data)
+_YAML_CACHE: Dict[str, Tuple[Stamp, Any]] = {}
+
+def _load_yaml_cached(p: Path) -> Any:
+    """Parse a YAML file, reusing the previous result while its stat is unchanged.
+
+    Results are cached in-process and as JSON under the user cache dir so
+    that a cold CLI start can skip YAML parsing. The returned object is
+    shared with the cache; callers that mutate it must copy it first.
+    Raises OSError (FileNotFoundError if missing) if the file cannot be read.
+    """
+    stamp = stat_stamp(p)
+    if stamp is None:
+        raise FileNotFoundError(f"No such file: {p}")
+    key = str(p)
+    hit = _YAML_CACHE.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    found, data = read_yaml_sidecar(p, stamp)
+    if not found:
+        data = yaml_load(p.read_bytes())
+        write_yaml_sidecar(p, stamp, data)
+    _YAML_CACHE[key] = (stamp, data)
+    return data
+
+def _refresh_yaml_cache(p: Path, data: Any, sort_keys: bool = False) -> None:
+    """Record freshly written data for p so the next load skips parsing."""
+    stamp = stat_stamp(p)
+    if stamp is not None:
+        write_yaml_sidecar(p, stamp, data, sort_keys=sort_keys)
+
+def _write_yaml(p: Path, data: Any, sort_keys: bool = False, **kwargs: Any) -> None:
+    """Dump data to p atomically (temp file + os.replace) and refresh its cache."""
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        yaml_dump(data, f, sort_keys=sort_keys, **kwargs)
+    os.replace(tmp, p)
+    _refresh_yaml_cache(p, data, sort_keys=sort_keys)
+
+def _read_yaml(p: Path, shared: bool = False) -> Dict[str, Any]:
+    """Read a YAML mapping, returning {} if missing or invalid.
+
+    With shared=True the cached object itself is returned and must not be mutated.
+    """
     try:
-        return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        data = _load_yaml_cached(p) or {}
+        return data if shared else copy.deepcopy(data)
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         logger.error(f"Could not read YAML from {p}: {e}")
         return {}
 
+class _YamlEntityStore:
+    """A list of id-numbered entities (todos, comments) kept in .eagle/<filename>.
+
+    Reads go through the shared YAML cache and writes are atomic; the
+    file holds {entity_key: [...], "next_id": n}.
+    """
+
+    # Files at schema_version 2 keep newest_first stores ordered newest first
+    NEWEST_FIRST_SCHEMA = 2
+
+    def __init__(self, filename: str, entity_key: str, newest_first: bool = False):
+        self.filename = filename
+        self.entity_key = entity_key
+        self.newest_first = newest_first
+
+    def path(self, proj: Project, create: bool = False) -> Path:
+        if create:
+            proj.ensure_meta()
+        return proj.meta_dir / self.filename
+
+    def load(self, proj: Project, shared: bool = False) -> Dict[str, Any]:
+        """Return the file's data with defaults filled in.
+
+        The result is a private copy unless shared=True, in which case it may
+        be the cached object itself and must not be mutated.
+        """
+        p = self.path(proj)
+        try:
+            data = _load_yaml_cached(p) or {}
+            if not shared:
+                data = copy.deepcopy(data)
+        except FileNotFoundError:
+            data = {}
+        except Exception as e:
+            logger.error(f"Could not load {self.entity_key} from {p}: {e}")
+            data = {}
+        if self.entity_key not in data or "next_id" not in data:
+            data = dict(data)
+            entities = data.setdefault(self.entity_key, [])
+            data.setdefault("next_id", max((e.get("id", 0) for e in entities), default=0) + 1)
+        if self.newest_first and data.get("schema_version", 1) < self.NEWEST_FIRST_SCHEMA:
+            # Older files are in insertion order; the next save persists the new one
+            data = dict(data)
+            data[self.entity_key] = sorted(
+                data[self.entity_key], key=lambda e: e.get("created_at", ""), reverse=True
+            )
+            data["schema_version"] = self.NEWEST_FIRST_SCHEMA
+        return data
+
+    def save(self, proj: Project, data: Dict[str, Any]) -> None:
+        """Write data atomically, skipping the write if the file already holds it."""
+        p = self.path(proj, create=True)
+        try:
+            if _load_yaml_cached(p) == data:
+                return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Could not compare {p} before saving: {e}")
+        _write_yaml(p, data, allow_unicode=True)
+
+    def append(self, proj: Project, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Store entry under the next free id and return the stored entity."""
+        data = self.load(proj)
+        entity = {"id": data["next_id"], **entry}
+        if self.newest_first:
+            data[self.entity_key].insert(0, entity)
+        else:
+            data[self.entity_key].append(entity)
+        data["next_id"] = entity["id"] + 1
+        self.save(proj, data)
+        return entity
+
+_TODOS_STORE = _YamlEntityStore("todos.yaml", "todos")
+_COMMENTS_STORE = _YamlEntityStore("comments.yaml", "comments", newest_first=True)
+
 def _load_tasks_for(proj: Project) -> Dict[str, Any]:
-    cfg = _read_yaml(proj.meta_dir / "config.yaml")
-    branch = _current_branch(proj)
-    bcfg = _read_yaml(proj.meta_dir / "branches" / branch / "config.yaml")
+    cfg = _read_yaml(proj.meta_dir / "config.yaml", shared=True)
     tasks = {}
     if isinstance(cfg.get("tasks"), dict):
         tasks.update(cfg["tasks"])
+    branches_dir = proj.meta_dir / "branches"
+    # No overlays at all: skip resolving the branch
+    if not branches_dir.is_dir():
+        return tasks
+    bcfg = _read_yaml(branches_dir / _current_branch(proj) / "config.yaml", shared=True)
     if isinstance(bcfg.get("tasks"), dict):
         tasks.update(bcfg["tasks"])
     return tasks
 
-def _exec_task(proj: Project, spec, extra_args: List[str] | None):
-    import shlex
-    env = os.environ.copy()
-    # dict script
-    if isinstance(spec, dict) and spec.get("type") == "script":
-        path = spec.get("path"); shell = spec.get("shell")
-        if isinstance(spec.get("env"), dict):
-            env.update({str(k): str(v) for k,v in spec["env"].items()})
-        if not path:
-            console.print("[red]Script task missing 'path'[/]"); raise typer.Exit(1)
-        script = (proj.path / path).resolve() if not Path(path).is_absolute() else Path(path)
-        if not script.exists():
-            console.print(f"[red]Script not found:[/] {script}"); raise typer.Exit(1)
-        args = extra_args or []
-        if shell in (None, "", "python"):
-            cmd = [sys.executable, str(script)] + args
-        elif shell == "bash":
-            cmd = ["bash", str(script)] + args
-        elif shell in ("pwsh","powershell"):
-            cmd = ["pwsh", "-File", str(script)] + args
-        elif shell in ("cmd","bat"):
-            cmd = ["cmd.exe", "/c", str(script)] + args
-        else:
-            cmd = [str(script)] + args
-        raise typer.Exit(subprocess.call(cmd, cwd=str(proj.path), env=env))
-
-    # string -> shell
-    if isinstance(spec, str):
-        cmd = spec
-        if extra_args:
-            cmd += " " + " ".join(shlex.quote(a) for a in extra_args)
-        raise typer.Exit(subprocess.call(cmd, shell=True, cwd=str(proj.path), env=env))
+# argv builders for {type: script} tasks, keyed by the task's 'shell' value
+_SHELL_BUILDERS = {
+    None: lambda script, args: [sys.executable, str(script), *args],
+    "": lambda script, args: [sys.executable, str(script), *args],
+    "python": lambda script, args: [sys.executable, str(script), *args],
+    "bash": lambda script, args: ["bash", str(script), *args],
+    "pwsh": lambda script, args: ["pwsh", "-File", str(script), *args],
+    "powershell": lambda script, args: ["pwsh", "-File", str(script), *args],
+    "cmd": lambda script, args: ["cmd.exe", "/c", str(script), *args],
+    "bat": lambda script, args: ["cmd.exe", "/c", str(script), *args],
+}
+
+def _direct_script_cmd(script: Path, args: List[str]) -> List[str]:
+    """Run the script as an executable when its shell is not recognized."""
+    return [str(script), *args]
+
+def _exec_script_task(proj: Project, spec: Dict[str, Any], extra_args: List[str] | None) -> NoReturn:
+    import subprocess
+    if spec.get("type") != "script":
+        _invalid_task_spec(proj, spec, extra_args)
+    path = spec.get("path"); shell = spec.get("shell")
+    env = None
+    if isinstance(spec.get("env"), dict):
+        env = {**os.environ, **{str(k): str(v) for k,v in spec["env"].items()}}
+    if not path:
+        console.print("[red]Script task missing 'path'[/]"); raise typer.Exit(1)
+    script = (proj.path / path).resolve() if not Path(path).is_absolute() else Path(path)
+    if not script.exists():
+        console.print(f"[red]Script not found:[/] {script}"); raise typer.Exit(1)
+    cmd = _SHELL_BUILDERS.get(shell, _direct_script_cmd)(script, extra_args or [])
+    raise typer.Exit(subprocess.call(cmd, cwd=str(proj.path), env=env))
+
+def _exec_shell_task(proj: Project, spec: str, extra_args: List[str] | None) -> NoReturn:
+    import subprocess
+    cmd = spec
+    if extra_args:
+        cmd += " " + " ".join(shlex.quote(a) for a in extra_args)
+    raise typer.Exit(subprocess.call(cmd, shell=True, cwd=str(proj.path)))
 
-    # list -> exec
-    if isinstance(spec, list):
-        cmd = spec + (extra_args or [])
-        raise typer.Exit(subprocess.call(cmd, cwd=str(proj.path), env=env))
+def _exec_argv_task(proj: Project, spec: List[str], extra_args: List[str] | None) -> NoReturn:
+    import subprocess
+    cmd = spec + (extra_args or [])
+    raise typer.Exit(subprocess.call(cmd, cwd=str(proj.path)))
 
+def _invalid_task_spec(proj: Project, spec: Any, extra_args: List[str] | None) -> NoReturn:
     console.print("[red]Task spec must be string, list, or {type: script} dict[/]")
     raise typer.Exit(1)
 
+# Task runners keyed by the spec's YAML type: dict -> script, str -> shell, list -> exec
+_TASK_RUNNERS = {
+    dict: _exec_script_task,
+    str: _exec_shell_task,
+    list: _exec_argv_task,
+}
+
+def _exec_task(proj: Project, spec: Any, extra_args: List[str] | None) -> None:
+    _TASK_RUNNERS.get(type(spec), _invalid_task_spec)(proj, spec, extra_args)
+
+def _spec_key(spec: Any) -> Any:
+    """Hashable form of a task spec: lists and dicts become tagged tuples."""
+    if isinstance(spec, dict):
+        return ("dict", tuple((k, _spec_key(v)) for k, v in spec.items()))
+    if isinstance(spec, list):
+        return ("list", tuple(_spec_key(v) for v in spec))
+    return spec
+
+def _spec_from_key(key: Any) -> Any:
+    if isinstance(key, tuple):
+        kind, items = key
+        if kind == "dict":
+            return {k: _spec_from_key(v) for k, v in items}
+        return [_spec_from_key(v) for v in items]
+    return key
+
+@functools.lru_cache(maxsize=128)
+def _format_spec(key: Any) -> str:
+    """Compact table text for a task spec, given its _spec_key form."""
+    spec = _spec_from_key(key)
+    if isinstance(spec, list):
+        return json.dumps(spec)
+    if isinstance(spec, dict):
+        text = f"{spec.get('type', '?')}:{spec.get('path', '')}"
+        return f"{text} ({spec['shell']})" if spec.get("shell") else text
+    return str(spec)
+
 @run_app.command("list")
 def run_list(
     name: Optional[str] = typer.Argument(None, help="Project name (defaults to current directory)"),
@@ -946,12 +1240,13 @@ def run_list(
     reg = _reg(); wsname = _cur_ws(reg, ws)
     proj = _project_from_name_or_cwd(name, ws=wsname)
     tasks = _load_tasks_for(proj)
-    table = Table(title=f"Tasks in {proj.name}")
-    table.add_column("Task", style="bold"); table.add_column("Spec")
     if not tasks:
         console.print("No tasks configured. Crea .eagle/config.yaml con un mapa 'tasks'."); return
+    from rich.table import Table
+    table = Table(title=f"Tasks in {proj.name}")
+    table.add_column("Task", style="bold"); table.add_column("Spec")
     for t, spec in tasks.items():
-        table.add_row(t, (json.dumps(spec) if isinstance(spec, list) else str(spec)))
+        table.add_row(t, _format_spec(_spec_key(spec)))
     console.print(table)
 
 @run_app.command("task")
@@ -1019,14 +1314,14 @@ def run_new(task: str,
                 script.write_text("param([String[]]$Args)\nWrite-Host \"Hello from $($MyInvocation.MyCommand.Name)\"\n", encoding="utf-8")
             spec = {"type": "script", "path": str(script.relative_to(proj.path)), "shell": "pwsh"}
         cfg["tasks"][task] = spec
-        cfg_path.write_text(yaml.safe_dump(cfg, sort_keys=True), encoding="utf-8")
+        _write_yaml(cfg_path, cfg, sort_keys=True)
         console.print(f"Scaffolded {script} and mapped task '{task}'")
         raise typer.Exit(0)
     if not cmd:
         console.print("Provide --cmd OR one of --bash/--python/--batch/--pwsh")
         raise typer.Exit(1)
     cfg["tasks"][task] = cmd
-    cfg_path.write_text(yaml.safe_dump(cfg, sort_keys=True), encoding="utf-8")
+    _write_yaml(cfg_path, cfg, sort_keys=True)
     console.print(f"Task created: {task} -> {cmd} at {cfg_path}")
 
 # ---------- TODO Management ----------
@@ -1034,7 +1329,10 @@ todo_app = typer.Typer(
     help="""Task and TODO management for projects.
 
 Manage TODOs and tasks for your projects with priorities, tags, and status tracking.
-Each project stores its TODOs in .eagle/todos.yaml.
+Each project stores its TODOs in .eagle/: todos.yaml is a snapshot and
+recent changes are appended to todos.log.jsonl, which is folded into the
+snapshot every 200 changes. Read both (or use ek todo list) for the
+current state; todos.yaml alone may be stale or not exist yet.
 
 You can manage TODOs from anywhere using --project flag.
 
@@ -1053,50 +1351,144 @@ Examples:
 )
 app.add_typer(todo_app, name="todo")
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 def _get_todos_file(proj: Project) -> Path:
     """Get the path to todos.yaml for a project."""
-    proj.ensure_meta()
-    return proj.meta_dir / "todos.yaml"
+    return _TODOS_STORE.path(proj, create=True)
 
-def _load_todos(proj: Project) -> Dict[str, Any]:
-    """Load TODOs from project's todos.yaml file."""
-    todos_file = _get_todos_file(proj)
-    if not todos_file.exists():
-        return {"todos": [], "next_id": 1}
+# Mutations are appended to todos.log.jsonl and folded back into
+# todos.yaml once the log reaches this many entries.
+_TODO_LOG_COMPACT_AT = 200
+
+def _get_todos_log_file(proj: Project) -> Path:
+    """Get the path to the append-only TODO operation log for a project."""
+    return proj.meta_dir / "todos.log.jsonl"
+
+def _replay_todo_log(data: Dict[str, Any], by_id: Dict[Any, Dict[str, Any]], log_file: Path) -> int:
+    """Apply logged TODO operations to data/by_id in place.
+
+    Operations only touch the todo whose id they name; every other snapshot
+    entry (including ones without an id) keeps its place. They are idempotent
+    so a log left behind by an interrupted compaction can be replayed again
+    safely. Returns the number of entries.
+    """
     try:
-        data = yaml.safe_load(todos_file.read_text(encoding="utf-8"))
-        if not data:
-            return {"todos": [], "next_id": 1}
-        # Ensure next_id exists
-        if "next_id" not in data:
-            data["next_id"] = max([t.get("id", 0) for t in data.get("todos", [])] or [0]) + 1
-        return data
-    except Exception as e:
-        logger.error(f"Could not load TODOs from {todos_file}: {e}")
-        return {"todos": [], "next_id": 1}
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return 0
+    todos = data["todos"]
+    removed = set()  # id() of dropped todo dicts
+    for line in lines:
+        try:
+            event = json.loads(line)
+            op = event["op"]
+            if op == "add":
+                todo = event["todo"]
+                existing = by_id.get(todo["id"])
+                if existing is not None:
+                    # Already folded into the snapshot before the log was dropped
+                    existing.clear()
+                    existing.update(todo)
+                else:
+                    by_id[todo["id"]] = todo
+                    todos.append(todo)
+                data["next_id"] = max(data.get("next_id", 1), todo["id"] + 1)
+            elif op == "update":
+                todo = by_id.get(event["id"])
+                if todo is not None:
+                    todo.update(event["fields"])
+            elif op == "remove":
+                todo = by_id.pop(event["id"], None)
+                if todo is not None:
+                    removed.add(id(todo))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Skipping malformed TODO log entry in {log_file}: {e}")
+    if removed:
+        data["todos"] = [t for t in todos if id(t) not in removed]
+    return len(lines)
+
+def _load_todos(proj: Project) -> Dict[str, Any]:
+    """Load TODOs from project's todos.yaml file plus its operation log.
+
+    The returned dict also carries a "by_id" index ({id: todo}) and each
+    todo the lower-cased fields from _normalize_todo; neither is persisted
+    by _save_todos.
+    """
+    _get_todos_file(proj)
+    return _read_todos(proj)
+
+def _read_todos(proj: Project) -> Dict[str, Any]:
+    """Like _load_todos, but without creating the .eagle/ directory."""
+    data = _TODOS_STORE.load(proj)
+    # Entries without an id stay in the list but cannot be addressed;
+    # with duplicate ids the first one wins, as in the snapshot order
+    by_id: Dict[Any, Dict[str, Any]] = {}
+    for t in data["todos"]:
+        if "id" in t:
+            by_id.setdefault(t["id"], t)
+    _replay_todo_log(data, by_id, _get_todos_log_file(proj))
+    for t in data["todos"]:
+        _normalize_todo(t)
+    data["by_id"] = by_id
+    return data
+
+# Lower-cased lookup fields added at load time; never written to disk
+_TODO_DERIVED_KEYS = ("_status", "_priority", "_tags_lower")
+
+def _normalize_todo(todo: Dict[str, Any]) -> None:
+    """Precompute the lower-cased status/priority/tags used by filters and stats."""
+    todo["_status"] = todo.get("status", "todo").lower()
+    todo["_priority"] = todo.get("priority", "med").lower()
+    todo["_tags_lower"] = frozenset(tg.lower() for tg in todo.get("tags", []))
 
 def _save_todos(proj: Project, data: Dict[str, Any]) -> None:
-    """Save TODOs to project's todos.yaml file."""
-    todos_file = _get_todos_file(proj)
-    todos_file.write_text(yaml.safe_dump(data, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    """Save TODOs to project's todos.yaml file and drop the operation log."""
+    data = {k: v for k, v in data.items() if k != "by_id"}
+    data["todos"] = [
+        {k: v for k, v in t.items() if k not in _TODO_DERIVED_KEYS}
+        for t in data.get("todos", [])
+    ]
+    _TODOS_STORE.save(proj, data)
+    _get_todos_log_file(proj).unlink(missing_ok=True)
 
+def _append_todo_events(proj: Project, *events: Dict[str, Any]) -> None:
+    """Record TODO mutations without rewriting todos.yaml.
+
+    Once the log is long enough it is folded into todos.yaml here, so only
+    TODO writes ever compact; reads never touch the files.
+    """
+    proj.ensure_meta()
+    log_file = _get_todos_log_file(proj)
+    with log_file.open("a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+    if log_file.read_bytes().count(b"\n") >= _TODO_LOG_COMPACT_AT:
+        _save_todos(proj, _read_todos(proj))
+
+_PRIORITY_EMOJI = {"high": "🔴", "med": "🟡", "low": "🟢"}
+_STATUS_EMOJI = {"todo": "⏳", "done": "✅", "blocked": "🚫"}
+
+@functools.lru_cache(maxsize=16)
 def _get_priority_emoji(priority: str) -> str:
     """Get emoji for priority level."""
-    return {"high": "🔴", "med": "🟡", "low": "🟢"}.get(priority.lower(), "⚪")
+    return _PRIORITY_EMOJI.get(priority.lower(), "⚪")
 
+@functools.lru_cache(maxsize=16)
 def _get_status_emoji(status: str) -> str:
     """Get emoji for status."""
-    return {"todo": "⏳", "done": "✅", "blocked": "🚫"}.get(status.lower(), "⏳")
+    return _STATUS_EMOJI.get(status.lower(), "⏳")
 
-def _format_todo_row(todo: Dict[str, Any]) -> tuple:
+@functools.lru_cache(maxsize=32)
+def _status_priority_text(status: str, priority: str) -> Tuple[str, str]:
+    """Get the (status, priority) cell texts for a TODO row."""
+    return (
+        f"{_get_status_emoji(status)} {status.upper()}",
+        f"{_get_priority_emoji(priority)} {priority.upper()}",
+    )
+
+def _format_todo_row(todo: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
     """Format a TODO as a table row."""
-    status_emoji = _get_status_emoji(todo.get("status", "todo"))
-    priority_emoji = _get_priority_emoji(todo.get("priority", "med"))
-    
-    status_text = f"{status_emoji} {todo.get('status', 'todo').upper()}"
-    priority_text = f"{priority_emoji} {todo.get('priority', 'med').upper()}"
+    status_text, priority_text = _status_priority_text(todo.get("status", "todo"), todo.get("priority", "med"))
     tags_text = ", ".join(todo.get("tags", []))
     
     return (
@@ -1129,22 +1521,28 @@ def todo_list(
       ek todo list --tag bug           # Only TODOs tagged with 'bug'
       ek todo list --search "auth"     # Search for 'auth' in TODOs
     """
+    from rich.table import Table
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_todos(proj)
     todos = data.get("todos", [])
     
-    # Apply filters
+    # Apply filters in a single pass, only for the ones supplied
+    preds = []
     if status:
-        todos = [t for t in todos if t.get("status", "todo").lower() == status.lower()]
+        status_lower = status.lower()
+        preds.append(lambda t: t["_status"] == status_lower)
     if priority:
-        todos = [t for t in todos if t.get("priority", "med").lower() == priority.lower()]
+        priority_lower = priority.lower()
+        preds.append(lambda t: t["_priority"] == priority_lower)
     if tag:
-        todos = [t for t in todos if tag.lower() in [tg.lower() for tg in t.get("tags", [])]]
+        tag_lower = tag.lower()
+        preds.append(lambda t: tag_lower in t["_tags_lower"])
     if search:
         search_lower = search.lower()
-        todos = [t for t in todos if 
-                 search_lower in t.get("title", "").lower() or 
-                 search_lower in t.get("description", "").lower()]
+        preds.append(lambda t: search_lower in t.get("title", "").lower() or
+                     search_lower in t.get("description", "").lower())
+    if preds:
+        todos = [t for t in todos if all(p(t) for p in preds)]
     
     if not todos:
         console.print(f"[yellow]No TODOs found for project '{proj.name}'[/]")
@@ -1159,15 +1557,13 @@ def todo_list(
     table.add_column("Title")
     table.add_column("Tags", style="dim")
     
-    pending = 0
-    completed = 0
+    rows = [_format_todo_row(todo) for todo in todos]
+    completed = sum(1 for todo in todos if todo["_status"] == "done")
+    pending = len(todos) - completed
     
-    for todo in todos:
-        table.add_row(*_format_todo_row(todo))
-        if todo.get("status", "todo").lower() == "done":
-            completed += 1
-        else:
-            pending += 1
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
     
     console.print(table)
     console.print(f"\nTotal: {len(todos)} TODOs ([green]{pending} pending[/], [blue]{completed} completed[/])")
@@ -1193,27 +1589,34 @@ def todo_add(
       ek todo add "New feature" --tags feature,ui    # With tags
       ek todo add "Bug fix" --project api            # Add to 'api' project
     """
+    from rich.prompt import Prompt
     proj = _project_from_name_or_cwd(project, ws)
-    data = _load_todos(proj)
     
     # Interactive mode
     if not title:
-        console.print("\n[bold blue]📝 Agregar nuevo TODO[/]\n")
-        title = Prompt.ask("[green]Título[/]")
-        description = Prompt.ask("[green]Descripción[/] [dim](opcional)[/]", default="")
-        priority = Prompt.ask(
-            "[green]Prioridad[/]",
-            choices=["low", "med", "high"],
-            default="med"
-        )
-        tags_input = Prompt.ask("[green]Tags[/] [dim](separados por comas, opcional)[/]", default="")
-        tags_list = [t.strip() for t in tags_input.split(",") if t.strip()] if tags_input else []
+        from concurrent.futures import ThreadPoolExecutor
+        # Load the TODOs in the background while the user answers the prompts
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            data_future = pool.submit(_load_todos, proj)
+            console.print("\n[bold blue]📝 Agregar nuevo TODO[/]\n")
+            title = Prompt.ask("[green]Título[/]")
+            description = Prompt.ask("[green]Descripción[/] [dim](opcional)[/]", default="")
+            priority = Prompt.ask(
+                "[green]Prioridad[/]",
+                choices=["low", "med", "high"],
+                default="med"
+            )
+            tags_input = Prompt.ask("[green]Tags[/] [dim](separados por comas, opcional)[/]", default="")
+            tags_list = [t.strip() for t in tags_input.split(",") if t.strip()] if tags_input else []
+            data = data_future.result()
     else:
         # Quick mode
+        data = _load_todos(proj)
         tags_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
     
     # Create TODO
     todo_id = data.get("next_id", 1)
+    now = datetime.now().isoformat()
     new_todo = {
         "id": todo_id,
         "title": title,
@@ -1221,13 +1624,11 @@ def todo_add(
         "status": "todo",
         "priority": priority.lower(),
         "tags": tags_list,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
+        "created_at": now,
+        "updated_at": now
     }
     
-    data["todos"].append(new_todo)
-    data["next_id"] = todo_id + 1
-    _save_todos(proj, data)
+    _append_todo_events(proj, {"op": "add", "todo": new_todo})
     
     priority_emoji = _get_priority_emoji(priority)
     console.print(f"\n✓ TODO #{todo_id} creado: [bold]\"{title}\"[/]")
@@ -1252,14 +1653,14 @@ def todo_done(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_todos(proj)
     
-    todo = next((t for t in data["todos"] if t["id"] == todo_id), None)
+    todo = data["by_id"].get(todo_id)
     if not todo:
         console.print(f"[red]TODO #{todo_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
     
     todo["status"] = "done"
     todo["updated_at"] = datetime.now().isoformat()
-    _save_todos(proj, data)
+    _append_todo_events(proj, {"op": "update", "id": todo_id, "fields": {"status": todo["status"], "updated_at": todo["updated_at"]}})
     
     console.print(f"✅ TODO #{todo_id} marcado como completado: [bold]\"{todo['title']}\"[/]")
 
@@ -1280,7 +1681,7 @@ def todo_remove(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_todos(proj)
     
-    todo = next((t for t in data["todos"] if t["id"] == todo_id), None)
+    todo = data["by_id"].get(todo_id)
     if not todo:
         console.print(f"[red]TODO #{todo_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
@@ -1290,8 +1691,7 @@ def todo_remove(
             console.print("[yellow]Cancelled[/]")
             raise typer.Exit(0)
     
-    data["todos"] = [t for t in data["todos"] if t["id"] != todo_id]
-    _save_todos(proj, data)
+    _append_todo_events(proj, {"op": "remove", "id": todo_id})
     
     console.print(f"🗑️  TODO #{todo_id} eliminado: [bold]\"{todo['title']}\"[/]")
 
@@ -1310,7 +1710,7 @@ def todo_show(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_todos(proj)
     
-    todo = next((t for t in data["todos"] if t["id"] == todo_id), None)
+    todo = data["by_id"].get(todo_id)
     if not todo:
         console.print(f"[red]TODO #{todo_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
@@ -1362,46 +1762,48 @@ def todo_edit(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_todos(proj)
     
-    todo = next((t for t in data["todos"] if t["id"] == todo_id), None)
+    todo = data["by_id"].get(todo_id)
     if not todo:
         console.print(f"[red]TODO #{todo_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
     
     changes = []
+    fields: Dict[str, Any] = {}
     
     if title:
-        todo["title"] = title
+        fields["title"] = title
         changes.append(f"título → \"{title}\"")
     
     if description is not None:  # Allow empty string
-        todo["description"] = description
+        fields["description"] = description
         changes.append("descripción")
     
     if priority:
         if priority.lower() not in ["low", "med", "high"]:
             console.print("[red]Priority must be: low, med, or high[/]")
             raise typer.Exit(1)
-        todo["priority"] = priority.lower()
+        fields["priority"] = priority.lower()
         changes.append(f"prioridad → {priority.upper()}")
     
     if status:
         if status.lower() not in ["todo", "done", "blocked"]:
             console.print("[red]Status must be: todo, done, or blocked[/]")
             raise typer.Exit(1)
-        todo["status"] = status.lower()
+        fields["status"] = status.lower()
         changes.append(f"estado → {status.upper()}")
     
     if tags is not None:
         tags_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
-        todo["tags"] = tags_list
+        fields["tags"] = tags_list
         changes.append(f"tags → {', '.join(tags_list) if tags_list else '(ninguno)'}")
     
     if not changes:
         console.print("[yellow]No changes specified. Use --title, --desc, --priority, --status, or --tags[/]")
         raise typer.Exit(0)
     
-    todo["updated_at"] = datetime.now().isoformat()
-    _save_todos(proj, data)
+    fields["updated_at"] = datetime.now().isoformat()
+    todo.update(fields)
+    _append_todo_events(proj, {"op": "update", "id": todo_id, "fields": fields})
     
     console.print(f"✓ TODO #{todo_id} actualizado:")
     for change in changes:
@@ -1423,7 +1825,7 @@ def todo_clear(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_todos(proj)
     
-    completed = [t for t in data["todos"] if t.get("status", "todo").lower() == "done"]
+    completed = [t for t in data["todos"] if t["_status"] == "done"]
     
     if not completed:
         console.print(f"[yellow]No completed TODOs found in project '{proj.name}'[/]")
@@ -1439,8 +1841,7 @@ def todo_clear(
             console.print("[yellow]Cancelled[/]")
             raise typer.Exit(0)
     
-    data["todos"] = [t for t in data["todos"] if t.get("status", "todo").lower() != "done"]
-    _save_todos(proj, data)
+    _append_todo_events(proj, *({"op": "remove", "id": t["id"]} for t in completed))
     
     console.print(f"✓ Eliminados {len(completed)} TODOs completados")
 
@@ -1463,23 +1864,25 @@ def todo_stats(
         console.print(f"[yellow]No TODOs found for project '{proj.name}'[/]")
         return
     
-    # Calculate statistics
-    total = len(todos)
-    pending = len([t for t in todos if t.get("status", "todo").lower() == "todo"])
-    done = len([t for t in todos if t.get("status", "todo").lower() == "done"])
-    blocked = len([t for t in todos if t.get("status", "todo").lower() == "blocked"])
+    # Calculate statistics in a single pass
+    status_counts: Counter = Counter()
+    priority_counts: Counter = Counter()
+    tag_counts: Counter = Counter()
+    for todo in todos:
+        status_counts[todo["_status"]] += 1
+        priority_counts[todo["_priority"]] += 1
+        tag_counts.update(todo.get("tags", []))
     
-    high = len([t for t in todos if t.get("priority", "med").lower() == "high"])
-    med = len([t for t in todos if t.get("priority", "med").lower() == "med"])
-    low = len([t for t in todos if t.get("priority", "med").lower() == "low"])
+    total = len(todos)
+    pending = status_counts["todo"]
+    done = status_counts["done"]
+    blocked = status_counts["blocked"]
     
-    # Count tags
-    tag_counts = {}
-    for todo in todos:
-        for tag in todo.get("tags", []):
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    high = priority_counts["high"]
+    med = priority_counts["med"]
+    low = priority_counts["low"]
     
-    top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_tags = tag_counts.most_common(5)
     
     # Display statistics
     console.print(f"\n{'━' * 60}")
@@ -1540,59 +1943,98 @@ app.add_typer(comment_app, name="comment")
 
 def _get_comments_file(proj: Project) -> Path:
     """Get the path to comments.yaml for a project."""
-    proj.ensure_meta()
-    return proj.meta_dir / "comments.yaml"
+    return _COMMENTS_STORE.path(proj, create=True)
 
-def _load_comments(proj: Project) -> Dict[str, Any]:
-    """Load comments from project's comments.yaml file."""
-    comments_file = _get_comments_file(proj)
-    if not comments_file.exists():
-        return {"comments": [], "next_id": 1}
-    try:
-        data = yaml.safe_load(comments_file.read_text(encoding="utf-8"))
-        if not data:
-            return {"comments": [], "next_id": 1}
-        if "next_id" not in data:
-            data["next_id"] = max([c.get("id", 0) for c in data.get("comments", [])] or [0]) + 1
-        return data
-    except Exception as e:
-        logger.error(f"Could not load comments from {comments_file}: {e}")
-        return {"comments": [], "next_id": 1}
+def _load_comments(proj: Project, shared: bool = False) -> Dict[str, Any]:
+    """Load comments from project's comments.yaml file.
+
+    Repeated loads of an unchanged file are served from the YAML cache;
+    pass shared=True from read-only commands to skip the defensive copy.
+    The returned dict also carries an "id_index" ({id: position in
+    comments}); it is not persisted by _save_comments.
+    """
+    _get_comments_file(proj)
+    data = dict(_COMMENTS_STORE.load(proj, shared=shared))
+    data["id_index"] = {c.get("id"): i for i, c in enumerate(data["comments"])}
+    return data
+
+def _build_tag_index(comments: List[Dict[str, Any]]) -> Dict[str, set]:
+    """Map each lower-cased tag to the ids of the comments carrying it."""
+    index: Dict[str, set] = {}
+    for c in comments:
+        for tag in c.get("tags", []):
+            index.setdefault(tag.lower(), set()).add(c.get("id"))
+    return index
+
+# (comments list, tag index) for the most recently indexed list
+_TAG_INDEX_CACHE: Optional[Tuple[List[Dict[str, Any]], Dict[str, set]]] = None
+
+def _comment_tag_index(comments: List[Dict[str, Any]]) -> Dict[str, set]:
+    """Tag index for comments, reused while the same list object is passed.
+
+    Shared loads return the cached list until comments.yaml changes, so the
+    index is only rebuilt when the file is.
+    """
+    global _TAG_INDEX_CACHE
+    if _TAG_INDEX_CACHE is None or _TAG_INDEX_CACHE[0] is not comments:
+        _TAG_INDEX_CACHE = (comments, _build_tag_index(comments))
+    return _TAG_INDEX_CACHE[1]
+
+# (comments list, search blobs) for the most recently searched list
+_SEARCH_BLOBS_CACHE: Optional[Tuple[List[Dict[str, Any]], List[str]]] = None
+
+def _comment_search_blobs(comments: List[Dict[str, Any]]) -> List[str]:
+    """Lower-cased message and tags of each comment, joined by \x01.
+
+    Reused while the same list object is passed, like _comment_tag_index.
+    """
+    global _SEARCH_BLOBS_CACHE
+    if _SEARCH_BLOBS_CACHE is None or _SEARCH_BLOBS_CACHE[0] is not comments:
+        blobs = [
+            "\x01".join([c.get("message", ""), *c.get("tags", [])]).lower()
+            for c in comments
+        ]
+        _SEARCH_BLOBS_CACHE = (comments, blobs)
+    return _SEARCH_BLOBS_CACHE[1]
 
 def _save_comments(proj: Project, data: Dict[str, Any]) -> None:
     """Save comments to project's comments.yaml file."""
-    comments_file = _get_comments_file(proj)
-    comments_file.write_text(yaml.safe_dump(data, sort_keys=False, allow_unicode=True), encoding="utf-8")
-
+    _COMMENTS_STORE.save(proj, {k: v for k, v in data.items() if k != "id_index"})
+
+_CATEGORY_EMOJI = {
+    "note": "📝",
+    "idea": "💡",
+    "bug": "🐛",
+    "warning": "⚠️",
+    "done": "✅",
+    "log": "📅",
+}
+_VALID_CATEGORIES = frozenset(_CATEGORY_EMOJI)
+
+@functools.lru_cache(maxsize=16)
 def _get_category_emoji(category: str) -> str:
     """Get emoji for comment category."""
-    return {
-        "note": "📝",
-        "idea": "💡",
-        "bug": "🐛",
-        "warning": "⚠️",
-        "done": "✅",
-        "log": "📅"
-    }.get(category.lower(), "📝")
-
-def _format_comment_row(comment: Dict[str, Any]) -> tuple:
+    return _CATEGORY_EMOJI.get(category.lower(), "📝")
+
+def _truncate(s: str, n: int) -> str:
+    """Cut s to n characters, marking the cut with '...'."""
+    return s if len(s) <= n else s[:n] + "..."
+
+def _format_comment_row(comment: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
     """Format a comment as a table row."""
-    category_emoji = _get_category_emoji(comment.get("category", "note"))
-    category_text = f"{category_emoji} {comment.get('category', 'note')}"
+    get = comment.get
+    category = get("category", "note")
+    category_text = f"{_get_category_emoji(category)} {category}"
     
     # Format date
-    created = comment.get("created_at", "")
+    created = get("created_at", "")
     date_str = created[:10] if created else "Unknown"
     
-    # Truncate message
-    message = comment.get("message", "")[:50]
-    if len(comment.get("message", "")) > 50:
-        message += "..."
-    
-    tags_text = ", ".join(comment.get("tags", []))
+    message = _truncate(get("message", ""), 50)
+    tags_text = ", ".join(get("tags", ()))
     
     return (
-        str(comment.get("id", "?")),
+        str(get("id", "?")),
         category_text,
         date_str,
         message,
@@ -1618,13 +2060,12 @@ def comment_add(
       ek comment add "Deployed to prod" --category log --project api
     """
     # Validate category
-    valid_categories = ["note", "idea", "bug", "warning", "done", "log"]
-    if category.lower() not in valid_categories:
-        console.print(f"[red]Invalid category. Must be one of: {', '.join(valid_categories)}[/]")
+    cat = category.lower()
+    if cat not in _VALID_CATEGORIES:
+        console.print(f"[red]Invalid category. Must be one of: {', '.join(_CATEGORY_EMOJI)}[/]")
         raise typer.Exit(1)
     
     proj = _project_from_name_or_cwd(project, ws)
-    data = _load_comments(proj)
     
     # Parse tags
     tags_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
@@ -1633,21 +2074,18 @@ def comment_add(
     author = os.getenv("USER", "unknown")
     
     # Create comment
-    comment_id = data.get("next_id", 1)
-    new_comment = {
-        "id": comment_id,
+    now_iso = datetime.now().isoformat()
+    new_comment = _COMMENTS_STORE.append(proj, {
         "message": message,
-        "category": category.lower(),
+        "category": cat,
         "tags": tags_list,
         "author": author,
-        "created_at": datetime.now().isoformat()
-    }
+        "created_at": now_iso
+    })
+    comment_id = new_comment["id"]
     
-    data["comments"].append(new_comment)
-    data["next_id"] = comment_id + 1
-    _save_comments(proj, data)
-    
-    category_emoji = _get_category_emoji(category)
+    # cat was validated above, so it is always a key
+    category_emoji = _CATEGORY_EMOJI[cat]
     console.print(f"\n✓ Comment #{comment_id} added to project [cyan]{proj.name}[/]")
     console.print(f"  [dim]Category:[/] {category_emoji} {category.upper()}")
     if tags_list:
@@ -1670,19 +2108,19 @@ def comment_list(
       ek comment list --tag urgent
       ek comment list --recent 10
     """
+    from rich.table import Table
     proj = _project_from_name_or_cwd(project, ws)
-    data = _load_comments(proj)
+    data = _load_comments(proj, shared=True)
     comments = data.get("comments", [])
     
     # Apply filters
     if category:
         comments = [c for c in comments if c.get("category", "note").lower() == category.lower()]
     if tag:
-        comments = [c for c in comments if tag.lower() in [t.lower() for t in c.get("tags", [])]]
-    
-    # Sort by date (newest first)
-    comments.sort(key=lambda c: c.get("created_at", ""), reverse=True)
+        ids = _comment_tag_index(data["comments"]).get(tag.lower(), set())
+        comments = [c for c in comments if c.get("id") in ids]
     
+    # Already stored newest first
     # Limit to recent
     if recent:
         comments = comments[:recent]
@@ -1700,8 +2138,10 @@ def comment_list(
     table.add_column("Comment")
     table.add_column("Tags", style="dim")
     
-    for comment in comments:
-        table.add_row(*_format_comment_row(comment))
+    rows = [_format_comment_row(comment) for comment in comments]
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
     
     console.print(table)
     console.print(f"\n{len(comments)} comment(s) total")
@@ -1719,12 +2159,13 @@ def comment_show(
       ek comment show 3 --project api
     """
     proj = _project_from_name_or_cwd(project, ws)
-    data = _load_comments(proj)
+    data = _load_comments(proj, shared=True)
     
-    comment = next((c for c in data["comments"] if c["id"] == comment_id), None)
-    if not comment:
+    idx = data["id_index"].get(comment_id)
+    if idx is None:
         console.print(f"[red]Comment #{comment_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
+    comment = data["comments"][idx]
     
     category_emoji = _get_category_emoji(comment.get("category", "note"))
     
@@ -1765,32 +2206,37 @@ def comment_edit(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_comments(proj)
     
-    comment = next((c for c in data["comments"] if c["id"] == comment_id), None)
-    if not comment:
+    idx = data["id_index"].get(comment_id)
+    if idx is None:
         console.print(f"[red]Comment #{comment_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
+    comment = data["comments"][idx]
     
     changes = []
     
-    if message:
+    if message and message != comment.get("message"):
         comment["message"] = message
-        changes.append(f"message → \"{message[:30]}...\"" if len(message) > 30 else f"message → \"{message}\"")
+        changes.append(f"message → \"{_truncate(message, 30)}\"")
     
     if category:
-        valid_categories = ["note", "idea", "bug", "warning", "done", "log"]
-        if category.lower() not in valid_categories:
-            console.print(f"[red]Invalid category. Must be one of: {', '.join(valid_categories)}[/]")
+        if category.lower() not in _VALID_CATEGORIES:
+            console.print(f"[red]Invalid category. Must be one of: {', '.join(_CATEGORY_EMOJI)}[/]")
             raise typer.Exit(1)
-        comment["category"] = category.lower()
-        changes.append(f"category → {category.upper()}")
+        if category.lower() != comment.get("category", "note"):
+            comment["category"] = category.lower()
+            changes.append(f"category → {category.upper()}")
     
     if tags is not None:
         tags_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
-        comment["tags"] = tags_list
-        changes.append(f"tags → {', '.join(tags_list) if tags_list else '(none)'}")
+        if tags_list != comment.get("tags", []):
+            comment["tags"] = tags_list
+            changes.append(f"tags → {', '.join(tags_list) if tags_list else '(none)'}")
     
     if not changes:
-        console.print("[yellow]No changes specified. Use --message, --category, or --tags[/]")
+        if message or category or tags is not None:
+            console.print(f"[yellow]Comment #{comment_id} already has those values; nothing to update[/]")
+        else:
+            console.print("[yellow]No changes specified. Use --message, --category, or --tags[/]")
         raise typer.Exit(0)
     
     _save_comments(proj, data)
@@ -1816,20 +2262,21 @@ def comment_remove(
     proj = _project_from_name_or_cwd(project, ws)
     data = _load_comments(proj)
     
-    comment = next((c for c in data["comments"] if c["id"] == comment_id), None)
-    if not comment:
+    idx = data["id_index"].get(comment_id)
+    if idx is None:
         console.print(f"[red]Comment #{comment_id} not found in project '{proj.name}'[/]")
         raise typer.Exit(1)
+    comment = data["comments"][idx]
     
     if not force:
-        preview = comment["message"][:50]
-        if len(comment["message"]) > 50:
-            preview += "..."
+        preview = _truncate(comment["message"], 50)
         if not typer.confirm(f"Remove comment #{comment_id}: \"{preview}\"?"):
             console.print("[yellow]Cancelled[/]")
             raise typer.Exit(0)
     
-    data["comments"] = [c for c in data["comments"] if c["id"] != comment_id]
+    data["comments"].pop(idx)
+    # Positions after idx shifted; the index is rebuilt on the next load
+    data.pop("id_index")
     _save_comments(proj, data)
     
     console.print(f"🗑️  Comment #{comment_id} removed")
@@ -1849,17 +2296,13 @@ def comment_search(
       ek comment search "bug" --project api
     """
     proj = _project_from_name_or_cwd(project, ws)
-    data = _load_comments(proj)
+    data = _load_comments(proj, shared=True)
     comments = data.get("comments", [])
     
     # Search in message and tags
     query_lower = query.lower()
-    matches = []
-    for comment in comments:
-        if query_lower in comment.get("message", "").lower():
-            matches.append(comment)
-        elif any(query_lower in tag.lower() for tag in comment.get("tags", [])):
-            matches.append(comment)
+    blobs = _comment_search_blobs(comments)
+    matches = [c for c, blob in zip(comments, blobs) if query_lower in blob]
     
     if not matches:
         console.print(f"[yellow]No comments found matching '{query}' in project '{proj.name}'[/]")
@@ -1869,9 +2312,7 @@ def comment_search(
     
     for comment in matches:
         category_emoji = _get_category_emoji(comment.get("category", "note"))
-        message_preview = comment["message"][:60]
-        if len(comment["message"]) > 60:
-            message_preview += "..."
+        message_preview = _truncate(comment["message"], 60)
         
         console.print(f"  [cyan]#{comment['id']}[/] {category_emoji} [dim]{comment.get('created_at', '')[:10]}[/]")
         console.print(f"      {message_preview}")
@@ -1908,21 +2349,27 @@ def comment_clear(
     cutoff_date = None
     
     if older_than:
-        from datetime import timedelta
         cutoff_date = datetime.now() - timedelta(days=older_than)
+        # created_at is written by isoformat(), so ISO strings compare chronologically
+        cutoff_iso = cutoff_date.isoformat()
     
     for comment in comments:
         should_remove = True
         
         # Check age
         if older_than:
-            try:
-                comment_date = datetime.fromisoformat(comment.get("created_at", ""))
-                if comment_date >= cutoff_date:
+            created = comment.get("created_at", "")
+            if "T" in created:
+                if created >= cutoff_iso:
+                    should_remove = False
+            else:
+                # Legacy or hand-edited dates: fall back to parsing
+                try:
+                    if datetime.fromisoformat(created) >= cutoff_date:
+                        should_remove = False
+                except Exception as e:
+                    logger.debug(f"Could not parse comment date: {e}")
                     should_remove = False
-            except Exception as e:
-                logger.debug(f"Could not parse comment date: {e}")
-                should_remove = False
         
         # Check category
         if category and comment.get("category", "note").lower() != category.lower():
@@ -1938,9 +2385,7 @@ def comment_clear(
     if not force:
         console.print(f"\n[bold]Comments to be removed:[/]")
         for comment in to_remove[:10]:  # Show max 10
-            msg_preview = comment["message"][:40]
-            if len(comment["message"]) > 40:
-                msg_preview += "..."
+            msg_preview = _truncate(comment["message"], 40)
             console.print(f"  • #{comment['id']}: {msg_preview}")
         
         if len(to_remove) > 10:
@@ -1952,12 +2397,41 @@ def comment_clear(
             raise typer.Exit(0)
     
     # Remove comments
-    data["comments"] = [c for c in comments if c not in to_remove]
+    remove_ids = {c.get("id") for c in to_remove}
+    data["comments"] = [c for c in comments if c.get("id") not in remove_ids]
     _save_comments(proj, data)
     
     console.print(f"✓ Removed {len(to_remove)} comment(s)")
 
 # ---------- Simple project commands ----------
+def _autoconfig_sentinel() -> Path:
+    """Marker recording which rc file 'ek add' last found configured."""
+    return get_paths().config_dir / ".shell_autoconfigured"
+
+def _autoconfig_sentinel_fresh(sentinel: Path, rc_file: Path) -> bool:
+    """True if sentinel names rc_file and rc_file has not changed since."""
+    try:
+        if os.stat(sentinel).st_mtime_ns < os.stat(rc_file).st_mtime_ns:
+            return False
+        return sentinel.read_text(encoding="utf-8") == str(rc_file)
+    except OSError:
+        return False
+
+def _file_contains(p: Path, needle: bytes) -> Optional[bool]:
+    """Search p for needle without reading it into memory; None if p is missing."""
+    import mmap
+    try:
+        f = p.open("rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(needle) != -1
+        except ValueError:
+            # Empty files cannot be mapped
+            return False
+
 @app.command()
 def add(
     path: str = typer.Argument(..., help="Path to project directory"),
@@ -2033,10 +2507,19 @@ def add(
     # Check if auto-loading is already configured
     source_line = "source ~/.eagle_projects"
     auto_configured = False
-    
-    if rc_file.exists():
-        content = rc_file.read_text()
-        if source_line not in content:
+    sentinel = _autoconfig_sentinel()
+    
+    if not _autoconfig_sentinel_fresh(sentinel, rc_file):
+        found = _file_contains(rc_file, source_line.encode())
+        if found is None:
+            # Create shell config with auto-loading
+            with open(rc_file, 'w') as f:
+                f.write(f"# Eagle Kit project variables (auto-added)\n")
+                f.write(f"if [ -f ~/.eagle_projects ]; then\n")
+                f.write(f"    {source_line}\n")
+                f.write(f"fi\n")
+            auto_configured = True
+        elif not found:
             # Add auto-loading to shell config automatically
             with open(rc_file, 'a') as f:
                 f.write(f"\n# Eagle Kit project variables (auto-added)\n")
@@ -2044,14 +2527,10 @@ def add(
                 f.write(f"    {source_line}\n")
                 f.write(f"fi\n")
             auto_configured = True
-    else:
-        # Create shell config with auto-loading
-        with open(rc_file, 'w') as f:
-            f.write(f"# Eagle Kit project variables (auto-added)\n")
-            f.write(f"if [ -f ~/.eagle_projects ]; then\n")
-            f.write(f"    {source_line}\n")
-            f.write(f"fi\n")
-        auto_configured = True
+        try:
+            sentinel.write_text(str(rc_file), encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"Could not write {sentinel}: {e}")
     
     # Show success and navigation info
     console.print(f"[bold green]✓[/] Project [cyan]{proj_name}[/] registered")
@@ -2077,6 +2556,47 @@ def add(
     console.print("")
     console.print(f"[dim]Alternative: [bold]ek cd {proj_name}[/][/]")
 
+def _todo_count_cache_file() -> Path:
+    return get_paths().cache_dir / "todo_counts.json"
+
+def _pending_todo_count(proj: Project, cache: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+    """Pending TODOs of proj (None if it has none stored) and whether cache changed.
+
+    cache maps a project's .eagle/ path to [todos.yaml stamp, log stamp, count]
+    so unchanged projects are counted without parsing anything.
+    """
+    todos_file = proj.meta_dir / "todos.yaml"
+    log_file = _get_todos_log_file(proj)
+    stamps = [stat_stamp(todos_file), stat_stamp(log_file)]
+    if stamps == [None, None]:
+        return None, False
+    key = str(proj.meta_dir)
+    hit = cache.get(key)
+    # JSON hands stamps back as lists
+    if hit and [tuple(s) if s else None for s in hit[:2]] == stamps:
+        return hit[2], False
+    todos = _read_todos(proj)["todos"]
+    pending = sum(1 for t in todos if t.get("status") != "done")
+    cache[key] = stamps + [pending]
+    return pending, True
+
+def _load_todo_count_cache() -> Dict[str, Any]:
+    try:
+        cache = json.loads(_todo_count_cache_file().read_bytes())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_todo_count_cache(cache: Dict[str, Any]) -> None:
+    p = _todo_count_cache_file()
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(tmp, p)
+    except OSError as e:
+        logger.debug(f"Could not save TODO count cache: {e}")
+
 @app.command("list")
 def list_projects():
     """List all registered projects in current workspace.
@@ -2117,28 +2637,32 @@ def list_projects():
     
     # Get all projects and count their TODOs
     projects = sorted(_projects(reg, cur).items())
+    count_cache = _load_todo_count_cache()
+    cache_dirty = False
+    rows = []
     
     for name, meta in projects:
         # Load TODO count for this project
         try:
             proj = Project(name=name, path=Path(meta["path"]))
-            todos_file = proj.meta_dir / "todos.yaml"
             todo_count = "—"
-            
-            if todos_file.exists():
-                todos_data = yaml.safe_load(todos_file.read_text(encoding="utf-8"))
-                if todos_data and "todos" in todos_data:
-                    # Count pending TODOs only
-                    pending = [t for t in todos_data["todos"] if t.get("status") != "done"]
-                    if len(pending) > 0:
-                        todo_count = f"[yellow]{len(pending)}[/yellow]"
-                    else:
-                        todo_count = "[green]—[/green]"
+            pending, changed = _pending_todo_count(proj, count_cache)
+            cache_dirty |= changed
+            if pending:
+                todo_count = f"[yellow]{pending}[/yellow]"
+            elif pending is not None:
+                todo_count = "[green]—[/green]"
         except Exception as e:
             todo_count = "—"
             logger.debug(f"Could not load TODO count for project {name}: {e}")
         
-        table.add_row("▸", name, meta["path"], todo_count)
+        rows.append(("▸", name, meta["path"], todo_count))
+    
+    if cache_dirty:
+        _save_todo_count_cache(count_cache)
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
     
     # Create header with Text for better formatting
     header = Text()
@@ -2173,6 +2697,7 @@ def status():
     Use 'ek add .' to register the current directory first.
     Use 'ek list' to see all registered projects.
     """
+    from rich.table import Table
     reg = _reg()
     ws = reg.get("current_workspace", "default")
     pr = _project_by_cwd(reg, ws)
@@ -2209,6 +2734,7 @@ def cd_project(
       ecd api                    # Quick navigate to 'api' project
     """
     if not project_name:
+        from rich.table import Table
         # Show list of available projects
         reg = _reg()
         ws = _cur_ws(reg, workspace)
@@ -2258,11 +2784,12 @@ def cd_project(
     
     # Try to copy to clipboard if possible
     try:
+        import shutil
         import subprocess
-        if subprocess.run(["which", "xclip"], capture_output=True).returncode == 0:
+        if shutil.which("xclip"):
             subprocess.run(["xclip", "-selection", "clipboard"], input=cd_command.encode())
             console.print("📋 [dim]Command copied to clipboard[/]")
-        elif subprocess.run(["which", "pbcopy"], capture_output=True).returncode == 0:
+        elif shutil.which("pbcopy"):
             subprocess.run(["pbcopy"], input=cd_command.encode())
             console.print("📋 [dim]Command copied to clipboard[/]")
     except Exception as e:
@@ -2284,6 +2811,7 @@ def plugins():
     Plugins extend Eagle Kit with additional commands and features.
     Install plugins as Python packages with 'eaglekit.plugins' entry points.
     """
+    from rich.table import Table
     table = Table(title="Eagle Kit — Installed Plugins")
     table.add_column("Plugin", style="bold")
     table.add_column("Module")
@@ -2365,6 +2893,24 @@ def plugin_list():
     plugins()
 
 
+def _remove_eaglekit_hooks(hooks_dir: Path) -> Tuple[List[str], List[str]]:
+    """Delete eaglekit-* files from a hooks directory; returns (removed, errors)."""
+    removed: List[str] = []
+    errors: List[str] = []
+    try:
+        entries = list(os.scandir(hooks_dir))
+    except OSError:
+        # No .git/hooks (not a repo, or project moved)
+        return removed, errors
+    for entry in entries:
+        if entry.name.startswith("eaglekit-"):
+            try:
+                os.unlink(entry.path)
+                removed.append(entry.path)
+            except OSError as e:
+                errors.append(f"Could not remove hook {entry.path}: {e}")
+    return removed, errors
+
 @plugin_app.command("uninstall")
 def plugin_uninstall(package: str = typer.Argument(..., help="Package name to uninstall")):
     """Uninstall a plugin package.
@@ -2381,27 +2927,38 @@ def plugin_uninstall(package: str = typer.Argument(..., help="Package name to un
         raise typer.Exit(0)
     
     try:
+        import shutil
         import subprocess
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "uninstall", package, "-y"
-        ], capture_output=True, text=True, check=False)
+        uv = shutil.which("uv")
+        if uv:
+            cmd = [uv, "pip", "uninstall", "--python", sys.executable, package]
+        else:
+            cmd = [sys.executable, "-m", "pip", "uninstall", package, "-y"]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
         
         if result.returncode == 0:
             console.print(f"[green]✓ Successfully uninstalled {package}[/]")
             # If uninstalling eaglekit-hooks, remove hooks from all projects
             if package == "eaglekit-hooks":
+                from concurrent.futures import ThreadPoolExecutor
                 reg = _reg()
-                for ws in reg.get("workspaces", {}):
-                    for name, meta in reg["workspaces"][ws]["projects"].items():
-                        proj_path = Path(meta["path"]).expanduser().resolve()
-                        git_hooks = proj_path / ".git" / "hooks"
-                        if git_hooks.exists():
-                            for hook_file in git_hooks.glob("eaglekit-*"):
-                                try:
-                                    hook_file.unlink()
-                                    console.print(f"[dim]Removed hook: {hook_file}")
-                                except Exception as e:
-                                    console.print(f"[yellow]Warning: Could not remove hook {hook_file}: {e}[/]")
+                hook_dirs = [
+                    Path(meta["path"]).expanduser().resolve() / ".git" / "hooks"
+                    for ws in reg.get("workspaces", {})
+                    for meta in reg["workspaces"][ws]["projects"].values()
+                ]
+                removed: List[str] = []
+                errors: List[str] = []
+                if hook_dirs:
+                    # Each project has its own hooks dir, so they can be swept concurrently
+                    with ThreadPoolExecutor(max_workers=min(32, len(hook_dirs))) as pool:
+                        for r, e in pool.map(_remove_eaglekit_hooks, hook_dirs):
+                            removed += r
+                            errors += e
+                if removed:
+                    console.print(f"[dim]Removed {len(removed)} hook(s):[/]\n[dim]" + "\n".join(removed) + "[/]")
+                for err in errors:
+                    console.print(f"[yellow]Warning: {err}[/]")
             console.print("")
             console.print("[bold yellow]Note:[/] Restart Eagle Kit to see changes")
         else:
@@ -2412,6 +2969,78 @@ def plugin_uninstall(package: str = typer.Argument(..., help="Package name to un
         console.print(f"[red]✗ Uninstall failed: {e}[/]")
 
 # ---------- Uninstall command ----------
+# Both patterns work on "\n" + rc text, so each line is matched with the newline
+# in front of it; dropping matches then behaves exactly like dropping lines from
+# content.split("\n") and joining the rest back with "\n".
+
+# The "(auto-added)" block written by 'ek add', through its closing 'fi'
+# (or to the end of the file when the 'fi' is missing)
+_RC_AUTO_BLOCK_RE = re.compile(
+    r"\n(?=[^\n]*Eagle Kit)(?=[^\n]*auto-added)[^\n]*"
+    r"(?:\n(?![^\S\n]*fi[^\S\n]*(?:\n|\Z))[^\n]*)*"
+    r"(?:\n[^\S\n]*fi[^\S\n]*(?=\n|\Z))?"
+)
+# Any other line mentioning Eagle Kit's variables or shell function
+_RC_STRAY_LINE_RE = re.compile(r"\n[^\n]*(?:eagle_projects|ek\(\)|ek-core)[^\n]*")
+
+# Anything _strip_eaglekit_rc can act on, matched in a single scan of the raw bytes
+_EK_MARKER_RE = re.compile(rb"Eagle Kit|eagle_projects|ek\(\)|ek-core")
+
+def _strip_eaglekit_rc(content: str) -> str:
+    """Remove Eagle Kit's auto-added block and stray ek lines from rc file text."""
+    text = _RC_AUTO_BLOCK_RE.sub("", "\n" + content)
+    return _RC_STRAY_LINE_RE.sub("", text)[1:]
+
+def _add_mode_bits(p: str, bits: int) -> None:
+    import stat
+    os.chmod(p, stat.S_IMODE(os.lstat(p).st_mode) | bits)
+
+def _rmtree(path: Path) -> None:
+    """shutil.rmtree that retries entries rmtree could not remove for lack of permission.
+
+    Covers read-only git objects and venv files without giving up halfway.
+    Only the write (and, for unreadable directories, read/search) bits are
+    added, and only inside the tree: the parent of path itself is never touched.
+    Raises OSError for anything that still cannot be removed.
+    """
+    import shutil
+    import stat
+    root = os.path.abspath(path)
+    reopened: set = set()
+
+    def _retry(func, p, exc) -> None:
+        # onexc passes the exception, onerror an exc_info tuple
+        err = exc if isinstance(exc, BaseException) else exc[1]
+        p_abs = os.path.abspath(p)
+        if isinstance(err, FileNotFoundError) and p_abs != root:
+            # Already removed by a retry of one of its parents
+            return
+        if not isinstance(err, PermissionError):
+            raise err
+        if func in (os.unlink, os.remove, os.rmdir):
+            if p_abs != root:
+                _add_mode_bits(os.path.dirname(p_abs), stat.S_IWUSR | stat.S_IXUSR)
+            if not os.path.islink(p):
+                _add_mode_bits(p, stat.S_IWUSR)
+            func(p)
+            return
+        # Listing a directory failed (os.open, os.scandir, os.lstat, ...):
+        # open it up and remove that subtree on its own, once
+        if p_abs in reopened or os.path.islink(p) or not os.path.isdir(p):
+            raise err
+        reopened.add(p_abs)
+        _add_mode_bits(p, stat.S_IRWXU)
+        _run(p)
+
+    def _run(target) -> None:
+        # onerror is deprecated from 3.12 on
+        if sys.version_info >= (3, 12):
+            shutil.rmtree(target, onexc=_retry)
+        else:
+            shutil.rmtree(target, onerror=_retry)
+
+    _run(path)
+
 @app.command("uninstall")
 def uninstall():
     """Completely remove Eagle Kit and all its data.
@@ -2430,6 +3059,8 @@ def uninstall():
     
     This is a complete removal - no need to run pipx uninstall separately.
     """
+    import shutil
+    import subprocess
     console.print("[bold red]⚠️  Eagle Kit Complete Uninstall[/]")
     console.print("")
     console.print("This will permanently remove:")
@@ -2457,10 +3088,14 @@ def uninstall():
     # Remove configuration directory
     paths = get_paths()
     config_dir = paths.config_dir
-    if config_dir.exists():
-        import shutil
-        shutil.rmtree(config_dir)
-        console.print("✓ Removed configuration directory")
+    for label, directory in (("configuration", config_dir), ("cache", paths.cache_dir)):
+        if not directory.exists():
+            continue
+        try:
+            _rmtree(directory)
+            console.print(f"✓ Removed {label} directory")
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not fully remove {directory}: {e}[/]")
     
     # Remove from shell configuration files
     shell_files = [
@@ -2470,82 +3105,93 @@ def uninstall():
     ]
     
     for shell_file in shell_files:
-        if shell_file.exists():
-            try:
-                content = shell_file.read_text()
-                lines = content.split('\n')
-                new_lines = []
-                skip_block = False
-                
-                for line in lines:
-                    # Skip Eagle Kit blocks
-                    if 'Eagle Kit' in line and 'auto-added' in line:
-                        skip_block = True
-                        continue
-                    elif skip_block and line.strip() == 'fi':
-                        skip_block = False
-                        continue
-                    elif skip_block:
-                        continue
-                    # Skip other Eagle Kit references
-                    elif any(keyword in line for keyword in ['eagle_projects', 'ek()', 'ek-core']):
-                        continue
-                    else:
-                        new_lines.append(line)
+        try:
+            data = shell_file.read_bytes()
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not clean {shell_file.name}: {e}[/]")
+            continue
+        # Most rc files never mention Eagle Kit; skip them without decoding
+        if not _EK_MARKER_RE.search(data):
+            continue
+        try:
+            content = data.decode()
+            new_content = _strip_eaglekit_rc(content)
+            
+            # Only write if content changed
+            if new_content != content:
+                shell_file.write_text(new_content)
+                console.print(f"✓ Cleaned {shell_file.name}")
                 
-                # Only write if content changed
-                new_content = '\n'.join(new_lines)
-                if new_content != content:
-                    shell_file.write_text(new_content)
-                    console.print(f"✓ Cleaned {shell_file.name}")
-                    
-            except Exception as e:
-                console.print(f"[yellow]Warning: Could not clean {shell_file.name}: {e}[/]")
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not clean {shell_file.name}: {e}[/]")
     
     console.print("")
     console.print("[bold blue]Removing Eagle Kit application...[/]")
     
-    # Try to uninstall via pipx
+    # Uninstall via pipx, or uv into this interpreter's environment
+    pipx = shutil.which('pipx')
+    uv = None if pipx else shutil.which('uv')
+    proc = None
+    tool = None
+    # What to suggest if the automatic removal fails: the command that was tried
+    manual_cmd = "pipx uninstall eaglekit"
     try:
-        result = subprocess.run(['pipx', 'uninstall', 'eaglekit'], 
-                              capture_output=True, text=True, check=False)
-        if result.returncode == 0:
-            console.print("✓ Removed Eagle Kit application via pipx")
+        if pipx:
+            tool = "pipx"
+            cmd = [pipx, 'uninstall', 'eaglekit']
+        elif uv:
+            tool = "uv"
+            cmd = [uv, 'pip', 'uninstall', '--python', sys.executable, 'eaglekit']
+            manual_cmd = shlex.join(['uv', *cmd[1:]])
         else:
-            console.print(f"[yellow]Warning: Could not remove via pipx: {result.stderr}[/]")
-            console.print("[dim]You may need to run: pipx uninstall eaglekit[/]")
-    except FileNotFoundError:
-        console.print("[yellow]Warning: pipx not found - could not auto-uninstall[/]")
-        console.print("[dim]You may need to run: pipx uninstall eaglekit[/]")
+            console.print("[yellow]Warning: neither pipx nor uv found - could not auto-uninstall[/]")
+            console.print(f"[dim]You may need to run: {manual_cmd}[/]")
+        if tool:
+            # Started now and collected below, so it overlaps the dev env cleanup
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     except Exception as e:
         console.print(f"[yellow]Warning: Could not auto-uninstall: {e}[/]")
-        console.print("[dim]You may need to run: pipx uninstall eaglekit[/]")
-    
-    # Clean PATH remnants and development environments
-    console.print("")
-    console.print("[bold blue]Cleaning development environments...[/]")
+        console.print(f"[dim]You may need to run: {manual_cmd}[/]")
     
     # Look for and clean common development paths
     dev_paths = [
         '/home/antonio/downloads/eaglekit_v2_1/test_env',
         Path.home() / 'downloads' / 'eaglekit_v2_1' / 'test_env',
     ]
-    
+    dev_messages = []
     for dev_path in dev_paths:
         dev_path = Path(dev_path)
         if dev_path.exists():
             try:
-                import shutil
-                shutil.rmtree(dev_path)
-                console.print(f"✓ Removed development environment: {dev_path}")
+                _rmtree(dev_path)
+                dev_messages.append(f"✓ Removed development environment: {dev_path}")
             except Exception as e:
-                console.print(f"[yellow]Warning: Could not remove {dev_path}: {e}[/]")
+                dev_messages.append(f"[yellow]Warning: Could not remove {dev_path}: {e}[/]")
+    
+    if proc is not None:
+        try:
+            _, stderr = proc.communicate()
+            if proc.returncode == 0:
+                console.print(f"✓ Removed Eagle Kit application via {tool}")
+            else:
+                console.print(f"[yellow]Warning: Could not remove via {tool}: {stderr}[/]")
+                console.print(f"[dim]You may need to run: {manual_cmd}[/]")
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not auto-uninstall: {e}[/]")
+            console.print(f"[dim]You may need to run: {manual_cmd}[/]")
+    
+    # Clean PATH remnants and development environments
+    console.print("")
+    console.print("[bold blue]Cleaning development environments...[/]")
+    for message in dev_messages:
+        console.print(message)
     
     # Check for ek commands in PATH and suggest cleanup
     try:
-        which_result = subprocess.run(['which', 'ek'], capture_output=True, text=True, check=False)
-        if which_result.returncode == 0 and which_result.stdout.strip():
-            ek_path = which_result.stdout.strip()
+        ek_path = shutil.which('ek')
+        if ek_path:
             console.print(f"[yellow]Note: ek command still found at: {ek_path}[/]")
             
             # If it's in a test_env, try to remove the parent directory
@@ -2553,14 +3199,13 @@ def uninstall():
                 test_env_dir = Path(ek_path).parent.parent
                 if test_env_dir.exists() and 'test_env' in str(test_env_dir):
                     try:
-                        import shutil
-                        shutil.rmtree(test_env_dir)
+                        _rmtree(test_env_dir)
                         console.print(f"✓ Removed test environment: {test_env_dir}")
                     except Exception as e:
                         console.print(f"[yellow]Warning: Could not remove {test_env_dir}: {e}[/]")
                         console.print(f"[dim]You may need to manually remove: {test_env_dir}[/]")
     except Exception as e:
-        logger.debug(f"Could not check for ek command in PATH: {e}")  # which command might not be available
+        logger.debug(f"Could not check for ek command in PATH: {e}")
     
     console.print("")
     console.print("[bold green]✅ Eagle Kit completely removed![/]")
@@ -1,34 +1,49 @@
 
 from __future__ import annotations
+import copy
+import functools
+import json
+import logging
+import os
+import zlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Tuple
-import yaml
-from platformdirs import user_config_dir
-import subprocess
+from typing import Dict, Any, Optional, Tuple
+from platformdirs import user_cache_dir, user_config_dir
+
+logger = logging.getLogger(__name__)
 
 APP_NAME = "eaglekit"
 META_DIR_NAME = ".eagle"
 
-@dataclass
+@dataclass(frozen=True)
 class Paths:
     config_dir: Path
     registry_file: Path
     defaults_file: Path
     workspaces_dir: Path
     secrets_dir: Path
+    cache_dir: Path
 
+@functools.lru_cache(maxsize=1)
 def get_paths() -> Paths:
+    """Eagle Kit's config locations, resolved once per process (nothing is created)."""
     cfg = Path(user_config_dir(APP_NAME))
-    cfg.mkdir(parents=True, exist_ok=True)
     return Paths(
         config_dir=cfg,
         registry_file=cfg / "registry.yaml",
         defaults_file=cfg / "defaults.yaml",
         workspaces_dir=cfg / "workspaces",
         secrets_dir=cfg / "secrets",
+        cache_dir=Path(user_cache_dir(APP_NAME)),
     )
 
+def ensure_paths() -> Paths:
+    """get_paths(), creating the config directory for callers about to write there."""
+    paths = get_paths()
+    paths.config_dir.mkdir(parents=True, exist_ok=True)
+    return paths
+
 def _default_registry() -> Dict[str, Any]:
     return {
         "current_workspace": "default",
@@ -49,21 +64,127 @@ def _ensure_shape(reg: Dict[str, Any]) -> Dict[str, Any]:
             data.setdefault("projects", {})
     return reg
 
+_yaml_codecs: Optional[Tuple[Any, Any]] = None
+
+def _yaml_safe_codecs() -> Tuple[Any, Any]:
+    """Import PyYAML on first use and return (SafeLoader, SafeDumper), preferring LibYAML."""
+    global _yaml_codecs
+    if _yaml_codecs is None:
+        try:
+            from yaml import CSafeLoader as loader, CSafeDumper as dumper
+        except ImportError:  # pragma: no cover - depends on the PyYAML build
+            from yaml import SafeLoader as loader, SafeDumper as dumper
+        _yaml_codecs = (loader, dumper)
+    return _yaml_codecs
+
+def yaml_load(stream: Any) -> Any:
+    """yaml.safe_load, through LibYAML when available."""
+    import yaml
+    return yaml.load(stream, Loader=_yaml_safe_codecs()[0])
+
+def yaml_dump(data: Any, stream: Any = None, **kwargs: Any) -> Optional[str]:
+    """yaml.safe_dump, through LibYAML when available."""
+    import yaml
+    return yaml.dump(data, stream, Dumper=_yaml_safe_codecs()[1], **kwargs)
+
+# (st_mtime_ns, st_size): cheap "has this file changed?" fingerprint
+Stamp = Tuple[int, int]
+
+def stat_stamp(p: Path) -> Optional[Stamp]:
+    """(mtime_ns, size) of p, or None if it does not exist."""
+    try:
+        st = os.stat(p)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _yaml_sidecar(p: Path) -> Tuple[Path, bytes]:
+    """Where the JSON copy of YAML file p lives, and the stamp it must carry.
+
+    Sidecars live in the user cache dir rather than next to p, so project
+    .eagle/ directories only hold what users wrote.
+    """
+    src = os.path.abspath(p)
+    key = os.fsencode(src)
+    name = f"{zlib.crc32(key):08x}{zlib.adler32(key):08x}.json"
+    return get_paths().cache_dir / "yaml" / name, key
+
+def _sidecar_stamp(key: bytes, stamp: Stamp) -> bytes:
+    # The source path guards against two files sharing a sidecar name
+    return b"%d %d %s" % (stamp[0], stamp[1], key)
+
+def write_yaml_sidecar(p: Path, stamp: Stamp, data: Any, sort_keys: bool = False) -> None:
+    """Store data as JSON in the cache dir, stamped with p's path, mtime and size.
+
+    Skipped when the document does not survive a JSON round-trip
+    (dates, non-string keys, ...), so the sidecar never changes what callers see.
+    sort_keys must match how p was dumped to preserve mapping order.
+    """
+    try:
+        body = json.dumps(data, ensure_ascii=False, sort_keys=sort_keys)
+        if json.loads(body) != data:
+            return
+        sidecar, key = _yaml_sidecar(p)
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        content = _sidecar_stamp(key, stamp) + b"\n" + body.encode("utf-8")
+        try:
+            tmp.write_bytes(content)
+        except FileNotFoundError:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(content)
+        os.replace(tmp, sidecar)
+    except (TypeError, ValueError, OSError) as e:
+        logger.debug(f"Could not write YAML cache for {p}: {e}")
+
+def read_yaml_sidecar(p: Path, stamp: Stamp) -> Tuple[bool, Any]:
+    """Return (True, data) if p's JSON sidecar was written for p at stamp."""
+    sidecar, key = _yaml_sidecar(p)
+    try:
+        header, _, body = sidecar.read_bytes().partition(b"\n")
+    except OSError:
+        return False, None
+    if header != _sidecar_stamp(key, stamp):
+        return False, None
+    try:
+        return True, json.loads(body)
+    except ValueError:
+        return False, None
+
+# Last registry read or written: (stamp, registry)
+_REGISTRY_CACHE: Optional[Tuple[Stamp, Dict[str, Any]]] = None
+
 def load_registry() -> Dict[str, Any]:
+    """Return a private copy of the registry, parsing the file only when it changed."""
+    global _REGISTRY_CACHE
     p = get_paths().registry_file
-    if not p.exists():
+    stamp = stat_stamp(p)
+    if stamp is None:
         return _default_registry()
-    with p.open("r", encoding="utf-8") as f:
-        reg = yaml.safe_load(f) or _default_registry()
-        return _ensure_shape(reg)
+    cached = _REGISTRY_CACHE
+    if cached is not None and cached[0] == stamp:
+        return copy.deepcopy(cached[1])
+    # A fresh JSON sidecar lets a cold start skip importing PyYAML altogether
+    found, reg = read_yaml_sidecar(p, stamp)
+    if not found:
+        with p.open("rb") as f:
+            reg = yaml_load(f)
+        write_yaml_sidecar(p, stamp, reg, sort_keys=True)
+    reg = _ensure_shape(reg or _default_registry())
+    _REGISTRY_CACHE = (stamp, reg)
+    return copy.deepcopy(reg)
 
 def save_registry(reg: Dict[str, Any]) -> None:
+    global _REGISTRY_CACHE
     reg = _ensure_shape(reg)
-    p = get_paths().registry_file
+    p = ensure_paths().registry_file
     with p.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(reg, f, sort_keys=True)
+        yaml_dump(reg, f, sort_keys=True)
+    stamp = stat_stamp(p)
+    _REGISTRY_CACHE = (stamp, copy.deepcopy(reg))
+    write_yaml_sidecar(p, stamp, reg, sort_keys=True)
 
 # placeholder for future git sync helpers
 def _git(cmd: list[str], cwd: Path) -> Tuple[int, str, str]:
+    import subprocess
     res = subprocess.run(["git", *cmd], cwd=str(cwd), capture_output=True, text=True)
     return res.returncode, res.stdout.strip(), res.stderr.strip()
@@ -2,34 +2,49 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-import os, subprocess, sys, shutil
+import os, sys
 
 from .config import META_DIR_NAME
 
+def _spawn(argv: list[str]) -> None:
+    """Start argv without waiting for it; editors and openers are fire-and-forget."""
+    if hasattr(os, "posix_spawnp"):
+        os.posix_spawnp(argv[0], argv, os.environ)
+    else:
+        import subprocess
+        subprocess.Popen(argv)
+
+# Platform's "open with default app" command, picked once at import
+if sys.platform.startswith("win"):
+    def _os_open(path: str) -> None:
+        os.startfile(path)  # type: ignore
+else:
+    _OPENER = "open" if sys.platform == "darwin" else "xdg-open"
+
+    def _os_open(path: str) -> None:
+        _spawn([_OPENER, path])
+
 @dataclass
 class Project:
+    # No per-instance __dict__ (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ("name", "path", "meta_dir", "todo_file")
+
     name: str
     path: Path
 
-    @property
-    def meta_dir(self) -> Path:
-        return self.path / META_DIR_NAME
-
-    @property
-    def todo_file(self) -> Path:
-        return self.meta_dir / "todo.json"
+    def __post_init__(self) -> None:
+        # Built once per Project; name and path are never reassigned
+        self.meta_dir: Path = self.path / META_DIR_NAME
+        self.todo_file: Path = self.meta_dir / "todo.json"
 
     def ensure_meta(self) -> None:
         self.meta_dir.mkdir(parents=True, exist_ok=True)
 
     def open_in_editor(self) -> None:
+        # Only needed here; keep it off the import path of every command
+        import shutil
         code = shutil.which("code")
         if code:
-            subprocess.run([code, str(self.path)], check=False)
+            _spawn([code, str(self.path)])
             return
-        if sys.platform.startswith("win"):
-            os.startfile(self.path)  # type: ignore
-        elif sys.platform == "darwin":
-            subprocess.run(["open", str(self.path)], check=False)
-        else:
-            subprocess.run(["xdg-open", str(self.path)], check=False)
+        _os_open(str(self.path))
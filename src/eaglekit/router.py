@@ -1,27 +1,49 @@
 
 from __future__ import annotations
-import sys, subprocess
+import sys
+from typing import Callable, Dict
 
-KNOWN = {
+KNOWN = frozenset((
   "add","init","list","remove","open","where",
   "todo","git","ws","run","notes","sync","status","cd","secrets",
   "setup","ignore","help","--help","-h","hooks","plugins","shell"
-}
+))
+_HELP = frozenset(("help", "--help", "-h"))
 
-def main():
+def _core(args: list[str]) -> int:
+    """Run the ek-core Typer app in this process.
+
+    Click ends standalone runs with SystemExit carrying the command's code;
+    0 is returned only if the app comes back without exiting.
+    """
+    from .cli import app
+    app(args=args, prog_name="ek")
+    return 0
+
+def _run_known(argv: list[str]) -> int:
+    # help aliases all mean the top-level --help
+    return _core(["--help"] if argv[0] in _HELP else argv)
+
+def _run_task(argv: list[str]) -> int:
+    # unknown first word -> treat as task name; argv is already [task, *args]
+    cmd = ["run", "task"]
+    cmd += argv
+    return _core(cmd)
+
+# First argument -> handler; options and task names are handled in main()
+_DISPATCH: Dict[str, Callable[[list[str]], int]] = {name: _run_known for name in KNOWN}
+
+def main() -> int:
     argv = sys.argv[1:]
     if not argv:
         # no args -> ek-core (will trigger setup if first run)
-        sys.exit(subprocess.call(["ek-core"]))
-    sub = argv[0]
-    rest = argv[1:]
+        return _core([])
+    # Interned, so a known command matches _DISPATCH's literal keys by identity
+    sub = sys.intern(argv[0])
+    handler = _DISPATCH.get(sub)
+    if handler is not None:
+        return handler(argv)
     # if it's an option (starts with dash), pass-through
     if sub.startswith("-"):
-        sys.exit(subprocess.call(["ek-core", *argv]))
-    # known commands (including help aliases)
-    if sub in KNOWN:
-        if sub in {"help","--help","-h"}:
-            sys.exit(subprocess.call(["ek-core", "--help"]))
-        sys.exit(subprocess.call(["ek-core", *argv]))
-    # otherwise treat as task name
-    sys.exit(subprocess.call(["ek-core", "run", "task", sub, *rest]))
+        return _core(argv)
+    return _run_task(argv)
@@ -37,15 +37,14 @@ ek() {
 
 
 def main():
-    """Main entry point that just delegates to ek-core for now."""
+    """Main entry point: runs the ek-core app in this process."""
     if len(sys.argv) > 1 and sys.argv[1] == "--shell-function":
         print(generate_shell_function())
         return
     
-    # For now, just delegate everything to ek-core
-    # The shell function installation will be handled separately
-    import subprocess
-    sys.exit(subprocess.call(["ek-core"] + sys.argv[1:]))
+    # Same commands as ek-core, without paying for a second interpreter
+    from eaglekit.cli import app
+    app(args=sys.argv[1:], prog_name="ek")
 
 
 if __name__ == "__main__":